@@ -0,0 +1,57 @@
+"""Per-chunk cost of the client audio ingest path.
+
+Compares the previous gain path (base64 -> bytes -> NumPy -> bytes ->
+base64 -> bytes) with AudioIngest for 1024-sample 16-bit frames, for both
+JSON/base64 and binary frames.
+
+    python -m benchmarks.bench_audio_ingest --chunks 20000
+"""
+import argparse
+import base64
+import timeit
+
+import numpy as np
+
+from services.audio_ingest import AudioIngest
+from services.audio_protocol import pack_audio_frame, unpack_frame
+
+CHUNK_SAMPLES = 1024
+
+
+def legacy_ingest(data, gain):
+    """The ingest path before AudioIngest, including its wrap-around on overflow"""
+    if gain != 1.0:
+        audio_array = np.frombuffer(base64.b64decode(data), dtype=np.int16)
+        audio_array = (audio_array * gain).astype(np.int16)
+        data = base64.b64encode(audio_array.tobytes()).decode("utf-8")
+    return base64.b64decode(data)
+
+
+def run(chunks, gain):
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-20000, 20000, CHUNK_SAMPLES, dtype=np.int16).tobytes()
+    encoded = base64.b64encode(pcm).decode("utf-8")
+    frame = pack_audio_frame(0, pcm)
+    ingest = AudioIngest(gain)
+
+    cases = {
+        "legacy json": lambda: legacy_ingest(encoded, gain),
+        "ingest json": lambda: ingest.ingest_base64(encoded),
+        "ingest binary": lambda: ingest.ingest(unpack_frame(frame)[2]),
+    }
+    print(f"{CHUNK_SAMPLES}-sample chunks, gain={gain}, {chunks} iterations")
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=chunks, repeat=3))
+        print(f"{name:<14} {seconds * 1e6 / chunks:8.2f} us/chunk")
+
+    clipped = np.frombuffer(ingest.ingest(pcm), dtype=np.int16)
+    wrapped = np.frombuffer(legacy_ingest(encoded, gain), dtype=np.int16)
+    print(f"samples that wrapped around in the legacy path: {int(np.count_nonzero(clipped != wrapped))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--gain", type=float, default=2.0)
+    args = parser.parse_args()
+    run(args.chunks, args.gain)
@@ -0,0 +1,62 @@
+"""Compare per-session cost of the JSON/base64 and binary audio protocols.
+
+Simulates one session's audio traffic in both directions (16 kHz client
+uplink, 24 kHz Gemini downlink) and reports wire bytes and CPU time spent
+encoding and decoding frames per second of audio.
+
+    python -m benchmarks.bench_audio_protocol --seconds 60
+"""
+import argparse
+import base64
+import json
+import os
+import time
+
+from services.audio_protocol import pack_audio_frame, unpack_frame
+
+SEND_SAMPLE_RATE = 16000
+RECEIVE_SAMPLE_RATE = 24000
+CHUNK_SAMPLES = 1024
+
+
+def json_roundtrip(chunk):
+    message = json.dumps({"audio": base64.b64encode(chunk).decode("utf-8")})
+    pcm = base64.b64decode(json.loads(message)["audio"])
+    return len(message), pcm
+
+
+def binary_roundtrip(chunk, sequence):
+    message = pack_audio_frame(sequence, chunk)
+    _frame_type, _sequence, pcm = unpack_frame(message)
+    return len(message), pcm
+
+
+def run(seconds):
+    results = {}
+    for direction, rate in (("uplink", SEND_SAMPLE_RATE), ("downlink", RECEIVE_SAMPLE_RATE)):
+        chunk = os.urandom(CHUNK_SAMPLES * 2)
+        chunks = int(seconds * rate / CHUNK_SAMPLES)
+
+        started = time.process_time()
+        json_bytes = sum(json_roundtrip(chunk)[0] for _ in range(chunks))
+        json_cpu = time.process_time() - started
+
+        started = time.process_time()
+        binary_bytes = sum(binary_roundtrip(chunk, seq)[0] for seq in range(chunks))
+        binary_cpu = time.process_time() - started
+
+        results[direction] = (json_bytes, json_cpu, binary_bytes, binary_cpu)
+
+    print(f"Per session, {seconds}s of audio, {CHUNK_SAMPLES}-sample chunks")
+    print(f"{'direction':<10} {'protocol':<8} {'bytes':>12} {'cpu ms':>10} {'cpu us/s audio':>15}")
+    for direction, (json_bytes, json_cpu, binary_bytes, binary_cpu) in results.items():
+        for name, wire, cpu in (("json", json_bytes, json_cpu), ("binary", binary_bytes, binary_cpu)):
+            print(f"{direction:<10} {name:<8} {wire:>12} {cpu * 1000:>10.1f} {cpu * 1e6 / seconds:>15.1f}")
+        print(f"{direction:<10} {'saving':<8} {1 - binary_bytes / json_bytes:>11.1%} "
+              f"{1 - binary_cpu / json_cpu if json_cpu else 0:>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="seconds of audio per direction")
+    run(parser.parse_args().seconds)
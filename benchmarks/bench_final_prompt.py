@@ -0,0 +1,83 @@
+"""Compare create_final_prompt against the previous chain of str.replace calls.
+
+    python -m benchmarks.bench_final_prompt --iterations 20000
+"""
+import argparse
+import json
+import os
+import timeit
+
+# The services import the API clients at module level; no request is ever sent
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from services.final_prompt import create_final_prompt
+from services.gemini_script import InterviewQuestionGenerator
+from services.prompts import agent_prompt
+
+
+def legacy_create_final_prompt(agent_prompt, role, mins, candidate_name, objective, question_focus,
+                               interviewer_details, role_personality, questions):
+    """The substitution step of create_final_prompt before it used a compiled template"""
+    context = "Evaluate the candidate's approach to problem-solving, code clarity, and efficiency."
+    follow_ups = ["Why did you choose this approach?", "What are the trade-offs?", "Can you optimize your solution?"]
+    evaluation_criteria = {
+        "excellent": "Demonstrates a clear understanding of the problem and provides an efficient solution.",
+        "acceptable": "Understands the problem and provides a functional solution.",
+        "poor": "Struggles to understand the problem or provides an inadequate solution."
+    }
+    final_prompt = agent_prompt.replace("{{role}}", role)
+    final_prompt = final_prompt.replace("{{mins}}", str(mins))
+    final_prompt = final_prompt.replace("{{name}}", candidate_name)
+    final_prompt = final_prompt.replace("{{objective}}", objective)
+    final_prompt = final_prompt.replace("{{questionFocus}}", ", ".join(question_focus))
+    final_prompt = final_prompt.replace("{{description}}", interviewer_details['description'])
+    final_prompt = final_prompt.replace("{{interviewerName}}", interviewer_details['name'])
+    final_prompt = final_prompt.replace("{{interviewerPersonality}}", role_personality)
+    final_prompt = final_prompt.replace("{{candidateName}}", candidate_name)
+    final_prompt = final_prompt.replace("{{questions}}", str(questions))
+    final_prompt = final_prompt.replace("{{context}}", context)
+    final_prompt = final_prompt.replace("{{follow_ups}}", ", ".join(follow_ups))
+    final_prompt = final_prompt.replace("{{evaluation_criteria.excellent}}", evaluation_criteria["excellent"])
+    final_prompt = final_prompt.replace("{{evaluation_criteria.acceptable}}", evaluation_criteria["acceptable"])
+    final_prompt = final_prompt.replace("{{evaluation_criteria.poor}}", evaluation_criteria["poor"])
+    final_prompt = final_prompt.replace("{{behavioralQuestions}}", "null")
+    return final_prompt
+
+
+def sample_questions(count=15):
+    return {"questions": [{
+        "question_text": f"Question {i}: walk me through how you would design a rate limiter.",
+        "question_type": "practical_scenario",
+        "follow_ups": ["What are the trade-offs?", "How would it scale?"],
+        "evaluation_criteria": {"excellent": "...", "acceptable": "...", "poor": "..."},
+    } for i in range(count)]}
+
+
+def run(iterations):
+    generator = InterviewQuestionGenerator()
+    role = "SD1"
+    questions = sample_questions()
+    objective = "Interview for Software Development Engineer 1 position"
+    new_args = (agent_prompt, role, 15, "Asha", objective, generator.role_specific_guidelines[role],
+                generator.role_personalities[role], generator.question_focus[role],
+                generator.interviewer_details[role], generator.mandatory_questions[role], questions,
+                generator.define_role_perspective(role))
+    legacy_args = (agent_prompt, role, 15, "Asha", objective, generator.question_focus[role],
+                   generator.interviewer_details[role], generator.role_personalities[role], questions)
+
+    assert create_final_prompt(*new_args) == legacy_create_final_prompt(*legacy_args)
+
+    for name, case in (("legacy str.replace", lambda: legacy_create_final_prompt(*legacy_args)),
+                       ("compiled template", lambda: create_final_prompt(*new_args))):
+        seconds = min(timeit.repeat(case, number=iterations, repeat=3))
+        print(f"{name:<20} {seconds * 1e6 / iterations:8.2f} us/prompt")
+
+    injected = create_final_prompt(*new_args[:3], "{{questions}}", *new_args[4:])
+    print("candidate-supplied {{questions}} left literal:", "Candidate Name: {{questions}}" in injected)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,108 @@
+"""The single-pass JD parser against the two separate scans it replaced.
+
+    python -m benchmarks.bench_jd_parsing                   # 1k and 10k line JDs plus the checked-in JD
+    python -m benchmarks.bench_jd_parsing --lines 50000
+
+Checks that parse_jd yields exactly the skills and requirements of the
+previous _extract_skills_from_jd and extract_job_requirements, then times
+them. "cold" is the first candidate for a JD; "warm" every later one, which
+gets the memoized parse.
+"""
+import argparse
+import os
+import sys
+import time
+
+from pdfminer.high_level import extract_text
+
+from benchmarks.fixtures import long_jd, pdf_fixtures
+from services.jd_parser import parse_jd
+
+
+def scan_skills(job_description):
+    """_extract_skills_from_jd as written before the parser"""
+    skills = []
+    for line in job_description.split('\n'):
+        if ":" in line or "•" in line or "-" in line:
+            skills.append(line.split(":")[-1].strip())
+            skills.append(line.split("•")[-1].strip())
+            skills.append(line.split("-")[-1].strip())
+    skills = [s for s in skills if s]
+    return list(set(skills))
+
+
+def scan_requirements(job_description):
+    """extract_job_requirements as written before the parser"""
+    requirements = []
+    lines = job_description.split('\n')
+    in_requirements_section = False
+    for line in lines:
+        line = line.strip()
+        if any(header in line.lower() for header in ['requirements', 'qualifications', 'skills']):
+            in_requirements_section = True
+            continue
+        if in_requirements_section and line:
+            if line.startswith('-') or line.startswith('•') or line.startswith('*'):
+                requirements.append(line[1:].strip())
+            elif line[0].isdigit() and len(line) > 1 and line[1] in ['.', ')']:
+                requirements.append(line[2:].strip())
+            elif len(line) < 100 and any(kw in line.lower() for kw in ['experience', 'knowledge', 'ability']):
+                requirements.append(line)
+        if in_requirements_section and not line:
+            in_requirements_section = False
+    if not requirements:
+        for line in lines:
+            if any(kw in line.lower() for kw in ['experience', 'knowledge', 'ability', 'proficient']):
+                requirements.append(line.strip())
+    return requirements
+
+
+def without_sections(job_description):
+    """The same JD with its section headers dropped, to exercise the keyword fallback"""
+    return "\n".join(line for line in job_description.split("\n")
+                     if not any(header in line.lower() for header in ['requirements', 'qualifications', 'skills']))
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", default="1000,10000", type=lambda value: [int(n) for n in value.split(",")],
+                        help="comma-separated JD sizes in lines")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats; the fastest counts")
+    args = parser.parse_args()
+
+    jds = {f"long_jd({lines})": long_jd(lines) for lines in args.lines}
+    for path in pdf_fixtures():
+        if path.parent.name == "jd":
+            jds[path.name] = extract_text(str(path))
+    jds.update({f"{name} without headers": without_sections(text) for name, text in list(jds.items())})
+
+    mismatches = 0
+    print(f"{'jd':<40} {'two scans ms':>13} {'cold ms':>9} {'warm us':>9}")
+    for name, text in jds.items():
+        parse_jd.cache_clear()
+        parsed = parse_jd(text)
+        if sorted(parsed.skills) != sorted(scan_skills(text)) or parsed.requirements != scan_requirements(text):
+            print(f"{name}: parse_jd differs from the previous scans")
+            mismatches += 1
+
+        scans = best_of(lambda: (scan_skills(text), scan_requirements(text)), args.repeat)
+        parse_jd.cache_clear()
+        cold = best_of(lambda: (parse_jd.cache_clear(), parse_jd(text)), args.repeat)
+        warm = best_of(lambda: parse_jd(text), args.repeat)
+        print(f"{name:<40} {scans * 1000:>13.1f} {cold * 1000:>9.1f} {warm * 1e6:>9.1f}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
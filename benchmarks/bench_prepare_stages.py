@@ -0,0 +1,180 @@
+"""Time and peak allocations of the CPU-bound interview preparation stages,
+checked against a stored baseline.
+
+    python -m benchmarks.bench_prepare_stages                    # compare, exit 1 on regression
+    python -m benchmarks.bench_prepare_stages --update-baseline  # record a new baseline
+    python -m benchmarks.bench_prepare_stages --stages skill     # only stages matching a regex
+
+Times are divided by a fixed pure-Python calibration loop before comparing,
+so a baseline recorded on one machine stays meaningful on a slower or
+faster one. Peak allocation is the tracemalloc peak of one call. Stages that
+take a resume analysis or JD start every call with the per-document memo
+caches empty, so they measure a first preparation rather than cache hits.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+# The services import the API clients at module level; no request is ever sent
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from benchmarks.fixtures import large_analysis, long_jd, pdf_fixtures
+from loadtest.payloads import sample_questions
+from services.final_prompt import create_final_prompt
+from services.gemini_script import InterviewQuestionGenerator, ResumeAnalyzer, required_skills_of
+from services.jd_parser import parse_jd
+from services.prompts import agent_prompt
+from services.role_prompts import RolePromptCache
+from services.skill_index import skill_index
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "prepare_stages.json"
+OBJECTIVE = "Interview for Software Development Engineer 1 position"
+
+
+def calibration():
+    """Fixed interpreter workload (dict, string and list operations) used as the time unit"""
+    counts = {}
+    for index in range(20000):
+        word = f"skill{index % 97}"
+        counts[word] = counts.get(word, 0) + len(word.lower())
+    return sorted(counts.items())
+
+
+def cold(function):
+    """function, called with the caches keyed by a JD or resume cleared first"""
+    def call():
+        parse_jd.cache_clear()
+        required_skills_of.cache_clear()
+        skill_index.cache_clear()
+        return function()
+    return call
+
+
+def build_stages():
+    generator = InterviewQuestionGenerator()
+    analyzer = ResumeAnalyzer("benchmark")
+    role_prompts = RolePromptCache(generator)
+    analysis = large_analysis()
+    jd = long_jd()
+    requirements = generator.extract_job_requirements(jd)
+    questions = [question["question_text"] for question in sample_questions(15)["questions"]]
+    role = "SD1"
+
+    stages = {}
+    for path in pdf_fixtures():
+        stages[f"parse_pdf[{path.name}]"] = lambda path=path: analyzer.parse_pdf(str(path))
+    stages.update({
+        "extract_green_flag_questions": lambda: generator.extract_green_flag_questions(analysis),
+        "extract_red_flag_questions": lambda: generator.extract_red_flag_questions(analysis),
+        "_extract_skills_from_jd": cold(lambda: generator._extract_skills_from_jd(jd)),
+        "extract_job_requirements": cold(lambda: generator.extract_job_requirements(jd)),
+        "analyze_skill_gaps": cold(lambda: generator.analyze_skill_gaps(analysis, requirements)),
+        "extract_domain_context": cold(lambda: generator.extract_domain_context(analysis, jd)),
+        "create_question_prompt": cold(lambda: generator.create_question_prompt(analysis, jd, role, 15)),
+        "create_final_prompt": lambda: create_final_prompt(
+            agent_prompt, role, 15, "Benchmark Candidate", OBJECTIVE,
+            generator.role_specific_guidelines[role], generator.role_personalities[role],
+            generator.question_focus[role], generator.interviewer_details[role],
+            generator.mandatory_questions[role], questions, generator.define_role_perspective(role),
+        ),
+        "role_prompts.render": lambda: role_prompts.render(role, 15, "Benchmark Candidate", OBJECTIVE, questions),
+    })
+    return stages
+
+
+def time_per_call(function, repeat):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def peak_allocation(function):
+    function()  # warm caches so only steady-state allocations count
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def measure(stages, repeat):
+    unit = time_per_call(calibration, repeat)
+    results = {}
+    for name, function in stages.items():
+        seconds = time_per_call(function, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "relative_time": seconds / unit,
+            "peak_bytes": peak_allocation(function),
+        }
+    return {"calibration_seconds": unit, "stages": results}
+
+
+def compare(current, baseline, time_tolerance, alloc_tolerance):
+    """Print one row per stage; returns the names of stages that regressed"""
+    regressions = []
+    print(f"{'stage':<48} {'us/call':>11} {'time':>8} {'peak KiB':>10} {'alloc':>8}")
+    for name, result in current["stages"].items():
+        reference = baseline.get("stages", {}).get(name)
+        time_change = alloc_change = None
+        status = "new"
+        if reference:
+            time_change = result["relative_time"] / reference["relative_time"] - 1
+            # A few KiB of slack keeps tiny stages from failing on allocator noise
+            alloc_change = (result["peak_bytes"] - reference["peak_bytes"]) / max(reference["peak_bytes"], 4096)
+            status = "ok"
+            if time_change > time_tolerance or alloc_change > alloc_tolerance:
+                status = "REGRESSION"
+                regressions.append(name)
+        print(f"{name:<48} {result['seconds'] * 1e6:>11.1f} {_percent(time_change):>8} "
+              f"{result['peak_bytes'] / 1024:>10.1f} {_percent(alloc_change):>8}  {status}")
+    return regressions
+
+
+def _percent(change):
+    return "-" if change is None else f"{change * 100:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--stages", help="only run stages whose name matches this regex")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per stage; the fastest counts")
+    parser.add_argument("--time-tolerance", type=float, default=0.5,
+                        help="allowed relative slowdown; shared machines vary by ~30%% run to run")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10, help="allowed relative peak growth")
+    args = parser.parse_args()
+
+    stages = build_stages()
+    if args.stages:
+        stages = {name: function for name, function in stages.items() if re.search(args.stages, name)}
+    current = measure(stages, args.repeat)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(current, baseline, args.time_tolerance, args.alloc_tolerance)
+
+    if args.update_baseline:
+        if args.stages and baseline:
+            baseline.setdefault("stages", {}).update(current["stages"])
+            current = dict(baseline, calibration_seconds=current["calibration_seconds"])
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} stage(s) regressed beyond tolerance: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Indexed skill matching against the pairwise substring scans it replaced, on long JDs.
+
+    python -m benchmarks.bench_skill_matching                  # 1k and 10k line JDs
+    python -m benchmarks.bench_skill_matching --lines 10000 --scale 80
+
+For every JD size it checks that extract_domain_context and
+analyze_skill_gaps return exactly what the pairwise versions return, then
+times both. "cold" includes building the JD's index (the first candidate for
+a JD); "warm" reuses it, as every later candidate for the same JD does.
+"""
+import argparse
+import os
+import sys
+import time
+
+# The services import the API clients at module level; no request is ever sent
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from benchmarks.fixtures import large_analysis, long_jd
+from services.gemini_script import InterviewQuestionGenerator, required_skills_of
+from services.jd_parser import parse_jd
+from services.skill_index import skill_index
+
+
+def pairwise_domain_matches(generator, analysis, job_description):
+    """strongMatches as computed before the index: every candidate skill against every JD phrase"""
+    validated = analysis.get('validated_skills', {})
+    skills = validated.get('technical', []) + validated.get('functional', []) + validated.get('leadership', [])
+    jd_skills = generator._extract_skills_from_jd(job_description)
+    return [skill for skill in skills
+            if any(jd_skill.lower() in skill.lower() or skill.lower() in jd_skill.lower() for jd_skill in jd_skills)]
+
+
+def pairwise_skill_gaps(analysis, requirements):
+    """analyze_skill_gaps as written before the index"""
+    validated = analysis.get('validated_skills', {})
+    all_skills = []
+    for category in ['technical', 'functional', 'leadership']:
+        all_skills.extend(validated.get(category, []))
+    all_skills.extend(analysis.get('unverified_skills', []))
+    candidate_skills = [skill.lower() for skill in all_skills]
+
+    required_skills = []
+    for req in requirements:
+        words = req.split()
+        for i in range(len(words)):
+            if words[i].lower() in ['experience', 'knowledge', 'skills', 'proficiency']:
+                continue
+            if any(tech in words[i].lower() for tech in ['python', 'java', 'react', 'node', 'sql', 'aws', 'azure', 'docker', 'kubernetes']):
+                required_skills.append(words[i])
+            if i < len(words) - 1:
+                phrase = f"{words[i]} {words[i+1]}"
+                if any(term in phrase.lower() for term in ['machine learning', 'data analysis', 'system design', 'team management']):
+                    required_skills.append(phrase)
+
+    return [skill for skill in required_skills
+            if not any(c in skill.lower() or skill.lower() in c for c in candidate_skills)]
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def cold(function):
+    """Time one call with every index cache emptied first"""
+    parse_jd.cache_clear()
+    required_skills_of.cache_clear()
+    skill_index.cache_clear()
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", default="1000,10000", type=lambda value: [int(n) for n in value.split(",")],
+                        help="comma-separated JD sizes in lines")
+    parser.add_argument("--scale", type=int, default=40, help="resume size multiplier (see large_analysis)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats; the fastest counts")
+    args = parser.parse_args()
+
+    generator = InterviewQuestionGenerator()
+    analysis = large_analysis(args.scale)
+    mismatches = 0
+
+    print(f"{'stage':<24} {'lines':>6} {'pairwise ms':>12} {'cold ms':>9} {'warm ms':>9} {'speedup':>8}")
+    for lines in args.lines:
+        jd = long_jd(lines)
+        requirements = generator.extract_job_requirements(jd)
+        stages = {
+            "extract_domain_context": (
+                lambda: pairwise_domain_matches(generator, analysis, jd),
+                lambda: generator.extract_domain_context(analysis, jd)['strongMatches'],
+            ),
+            "analyze_skill_gaps": (
+                lambda: pairwise_skill_gaps(analysis, requirements),
+                lambda: generator.analyze_skill_gaps(analysis, requirements),
+            ),
+        }
+        for name, (pairwise, indexed) in stages.items():
+            if pairwise() != indexed():
+                print(f"{name}: indexed result differs from the pairwise result on {lines} lines")
+                mismatches += 1
+            pairwise_seconds = best_of(pairwise, args.repeat)
+            cold_seconds = cold(indexed)
+            warm_seconds = best_of(indexed, args.repeat)
+            print(f"{name:<24} {lines:>6} {pairwise_seconds * 1000:>12.1f} {cold_seconds * 1000:>9.2f} "
+                  f"{warm_seconds * 1000:>9.2f} {pairwise_seconds / warm_seconds:>7.0f}x")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
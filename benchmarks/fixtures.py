@@ -0,0 +1,94 @@
+"""Deterministic inputs for the preparation-stage benchmarks.
+
+Everything here is generated from fixed seeds, so a baseline recorded on
+one commit stays comparable with the next.
+"""
+import copy
+import random
+from pathlib import Path
+
+from loadtest.payloads import sample_analysis
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TECHNOLOGIES = [
+    "Python", "Java", "Go", "Rust", "TypeScript", "React", "Node.js", "Django", "FastAPI", "Spring Boot",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka", "RabbitMQ", "Docker", "Kubernetes", "Terraform",
+    "AWS", "Azure", "GCP", "GraphQL", "gRPC", "Airflow", "Spark", "Pandas", "TensorFlow", "PyTorch", "SQL",
+]
+PHRASES = [
+    "machine learning", "data analysis", "system design", "team management", "distributed systems",
+    "API design", "code review", "incident response", "performance tuning", "CI/CD pipelines",
+]
+RELEVANCE = ("HIGH", "MEDIUM", "LOW")
+
+
+def large_analysis(scale=40, seed=7):
+    """A resume analysis with ``scale`` times the employers, projects and flags of the sample"""
+    rng = random.Random(seed)
+    analysis = sample_analysis()
+    base = copy.deepcopy(analysis)
+
+    analysis["employment_history"] = [
+        dict(job, company=f"{job['company']} {index}", role=rng.choice(["Engineer", "Senior Engineer", "Lead"]))
+        for index in range(scale) for job in base["employment_history"]
+    ]
+    analysis["key_projects"] = [dict(project, name=f"{project['name']} {index}")
+                                for index in range(scale) for project in base["key_projects"]]
+    analysis["validated_skills"] = {
+        "technical": rng.sample(TECHNOLOGIES, 20) + [f"Internal tool {n}" for n in range(scale)],
+        "functional": rng.sample(PHRASES, 6),
+        "leadership": ["Mentoring", "Hiring", "Roadmap planning"],
+    }
+    analysis["unverified_skills"] = rng.sample(TECHNOLOGIES, 10)
+
+    for section in ("green_flags", "red_flags"):
+        for category, flags in base[section].items():
+            template = flags[0] if flags else {"type": category.upper(), "details": category,
+                                               "interview_question": f"Tell me about {category}."}
+            level_key = "relevance" if section == "green_flags" else "severity"
+            analysis[section][category] = [
+                # Every third flag repeats an earlier one, so de-duplication has work to do
+                dict(template, details=f"{template['details']} #{index - index % 3 if index % 3 == 2 else index}",
+                     **{level_key: rng.choice(RELEVANCE)})
+                for index in range(scale)
+            ]
+    return analysis
+
+
+def long_jd(lines=2000, seed=11):
+    """A job description of roughly ``lines`` lines with bullets, numbered
+    lists, requirement headers and free prose, like pasted-together postings"""
+    rng = random.Random(seed)
+    out = ["Senior Software Engineer - Platform", ""]
+    while len(out) < lines:
+        section = rng.choice(["Requirements", "Qualifications", "Skills", "About the team", "Benefits"])
+        out.append(f"{section}:")
+        for index in range(rng.randint(5, 15)):
+            tech = rng.choice(TECHNOLOGIES)
+            phrase = rng.choice(PHRASES)
+            style = rng.randrange(5)
+            if style == 0:
+                out.append(f"- {rng.randint(2, 8)}+ years of experience with {tech} and {phrase}")
+            elif style == 1:
+                out.append(f"• Strong knowledge of {tech}; ability to lead {phrase} efforts")
+            elif style == 2:
+                out.append(f"{index + 1}. Proficient in {tech} - hands-on {phrase}")
+            elif style == 3:
+                out.append(f"* Familiarity with {tech}/{rng.choice(TECHNOLOGIES)} in production: {phrase}")
+            else:
+                out.append(f"We value people who enjoy {phrase} and write clear {tech} code every day.")
+        out.append("")
+    return "\n".join(out[:lines])
+
+
+# Real-world PDFs checked into temp/ (uploads land in the same folders, so they are listed by name)
+PDF_FIXTURES = [
+    "temp/resume/Siddharth_Verma_SDE_2.pdf",
+    "temp/resume/Siddharth_Verma_AEM_Ready_Resume.pdf",
+    "temp/jd/JD-Valuebound.pdf",
+]
+
+
+def pdf_fixtures():
+    return [REPO_ROOT / path for path in PDF_FIXTURES]
@@ -6,12 +6,56 @@ from google.genai import types
 from pathlib import Path
 from fastapi import FastAPI
 
+# Uploads, prompts and the default session store live here whatever directory the server,
+# a benchmark or prepare_batch.py is started from, so every process finds the same files
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMP_DIR = PROJECT_ROOT / "temp"
+
 FORMAT = "int16"  # Format now as string since we're not using PyAudio directly
 CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
 CHUNK_SIZE = 1024
 
+# Upstream packetization: client chunks are batched up to UPSTREAM_PACKET_MS of
+# audio, waiting at most UPSTREAM_FLUSH_MS after the first chunk of a packet
+UPSTREAM_PACKET_MS = int(os.environ.get("UPSTREAM_PACKET_MS", 40))
+UPSTREAM_FLUSH_MS = int(os.environ.get("UPSTREAM_FLUSH_MS", 60))
+
+# Per-session upstream audio queue: bounded by bytes and by milliseconds of queued
+# audio; under pressure it drops the oldest chunks (drop_oldest) or the oldest
+# non-speech chunks first (drop_silence)
+AUDIO_QUEUE_MAX_BYTES = int(os.environ.get("AUDIO_QUEUE_MAX_BYTES", 256 * 1024))
+AUDIO_QUEUE_MAX_LATENCY_MS = int(os.environ.get("AUDIO_QUEUE_MAX_LATENCY_MS", 2000))
+AUDIO_QUEUE_POLICY = os.environ.get("AUDIO_QUEUE_POLICY", "drop_silence")
+
+# Local voice activity detection: silent client audio is dropped before it goes upstream.
+# The hangover should exceed the silence_duration_ms given to Gemini below.
+VAD_ENABLED = os.environ.get("VAD_ENABLED", "1") == "1"
+VAD_ENERGY_THRESHOLD_DB = float(os.environ.get("VAD_ENERGY_THRESHOLD_DB", -50.0))
+VAD_HANGOVER_MS = int(os.environ.get("VAD_HANGOVER_MS", 1200))
+VAD_PREROLL_MS = int(os.environ.get("VAD_PREROLL_MS", 200))
+
+# audio_stream_end is sent once no speech has been forwarded for this long
+SILENCE_TIMEOUT_SECONDS = float(os.environ.get("SILENCE_TIMEOUT_SECONDS", 2.0))
+
+# Open the Gemini Live session while the interview is being prepared instead of after it.
+# Failed attempts are retried with backoff until preparation finishes.
+LIVE_PRECONNECT = os.environ.get("LIVE_PRECONNECT", "1") == "1"
+LIVE_CONNECT_RETRY_SECONDS = float(os.environ.get("LIVE_CONNECT_RETRY_SECONDS", 0.5))
+
+# Warm pool of idle, already connected Live sessions handed to new interviews (0 disables it).
+# Idle sessions older than LIVE_POOL_MAX_IDLE_SECONDS are closed and replaced.
+LIVE_POOL_SIZE = int(os.environ.get("LIVE_POOL_SIZE", 0))
+LIVE_POOL_MAX_IDLE_SECONDS = float(os.environ.get("LIVE_POOL_MAX_IDLE_SECONDS", 300))
+LIVE_POOL_CHECK_SECONDS = float(os.environ.get("LIVE_POOL_CHECK_SECONDS", 5))
+
+# Point the services at local stand-ins (see loadtest/) instead of the real APIs, e.g.
+#   GEMINI_LIVE_URL=ws://localhost:9100  OPENAI_BASE_URL=http://localhost:9200/v1
+# The API keys must still be set, but any value works.
+GEMINI_LIVE_URL = os.environ.get("GEMINI_LIVE_URL")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
+
 MODEL = "models/gemini-2.0-flash-live-001"
 
 # Initialize Gemini client
@@ -47,9 +91,40 @@ CONFIG = types.LiveConnectConfig(
 )
 
 
+# Interview preparation
+PDF_POOL_WORKERS = int(os.environ.get("PDF_POOL_WORKERS", 2))
+ANALYSIS_CACHE_MEMORY_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_MEMORY_ENTRIES", 256))
+ANALYSIS_CACHE_DISK_MB = int(os.environ.get("ANALYSIS_CACHE_DISK_MB", 64))
+QUESTION_CACHE_TTL_SECONDS = int(os.environ.get("QUESTION_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+TEXT_CACHE_MEMORY_ENTRIES = int(os.environ.get("TEXT_CACHE_MEMORY_ENTRIES", 256))
+TEXT_CACHE_DISK_MB = int(os.environ.get("TEXT_CACHE_DISK_MB", 64))
+
+# Uploads are streamed to disk in chunks; larger files or PDFs with more pages are rejected
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+UPLOAD_MAX_PAGES = int(os.environ.get("UPLOAD_MAX_PAGES", 20))
+UPLOAD_CHUNK_BYTES = int(os.environ.get("UPLOAD_CHUNK_BYTES", 256 * 1024))
+
+# Interview sessions
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", 2 * 3600))
+SESSION_MEMORY_BUDGET_MB = int(os.environ.get("SESSION_MEMORY_BUDGET_MB", 256))
+# Where sessions, question sets and prompts are shared between workers (parsed text and
+# analyses use the caches under TEMP_DIR/cache):
+# memory:// (one worker only), sqlite:///path/to/file.db (one host) or redis://host:port/db
+SESSION_STORE_URL = os.environ.get("SESSION_STORE_URL", f"sqlite:///{TEMP_DIR / 'sessions' / 'sessions.db'}")
+
+# Batch preparation from a candidate manifest (prepare_batch.py): candidates prepared at once,
+# attempts per candidate, and how long prepared sessions wait in the store for their interview
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", 8))
+BATCH_MAX_ATTEMPTS = int(os.environ.get("BATCH_MAX_ATTEMPTS", 5))
+BATCH_SESSION_TTL_SECONDS = int(os.environ.get("BATCH_SESSION_TTL_SECONDS", 48 * 3600))
+
+# uvicorn worker processes; with more than one the interview websocket is served at /ws on port 8000
+WEB_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+
 # Create temp directories
-TEMP_DIR = Path("temp")
 TEMP_DIR.mkdir(exist_ok=True)
 (TEMP_DIR / "resume").mkdir(exist_ok=True)
 (TEMP_DIR / "jd").mkdir(exist_ok=True)
+(TEMP_DIR / "prompts").mkdir(exist_ok=True)
+(TEMP_DIR / "sessions").mkdir(exist_ok=True)
 
@@ -0,0 +1,132 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+# Interview session of the current task; asyncio tasks inherit it from the
+# task that created them, so setting it once per connection tags every record.
+session_id_var = contextvars.ContextVar("session_id", default=None)
+
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "session_id", "sample"}
+
+_listener = None
+
+
+class SessionContextFilter(logging.Filter):
+    """Attach the current session ID to every record"""
+
+    def filter(self, record):
+        if getattr(record, "session_id", None) is None:
+            record.session_id = session_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Pass only every ``every``-th record per sample key.
+
+    Hot-path call sites log with ``extra={"sample": "<key>"}``; records
+    without a sample key always pass.
+    """
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts = {}
+
+    def filter(self, record):
+        key = getattr(record, "sample", None)
+        if key is None:
+            return True
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback out of the message text"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the record's extra fields included"""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.session_id:
+            entry["session_id"] = record.session_id
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def _parse_levels(spec):
+    """Parse "module=LEVEL,other.module=LEVEL" into a dict"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    """Route all logging through a non-blocking queue drained by a background thread.
+
+    Configured from the environment:
+      LOG_LEVEL         root level (default INFO)
+      LOG_LEVELS        per-module levels, e.g. "services.gemini_audio_socket_handler=DEBUG"
+      LOG_FORMAT        "json" (default) or "text"
+      LOG_SAMPLE_EVERY  keep one in N records for each hot-path sample key (default 100)
+
+    Per-chunk audio events are logged at DEBUG with a sample key, so the
+    default configuration performs no I/O per audio chunk.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.environ.get("LOG_FORMAT", "json") == "text":
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(session_id)s] %(message)s"
+        ))
+    else:
+        stream_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    # Filters run on the caller's task, so the session context is still available
+    queue_handler.addFilter(SessionContextFilter())
+    queue_handler.addFilter(SamplingFilter(int(os.environ.get("LOG_SAMPLE_EVERY", 100))))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    for name, level in _parse_levels(os.environ.get("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
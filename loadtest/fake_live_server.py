@@ -0,0 +1,146 @@
+"""Stand-in for the Gemini Live websocket that answers every turn with synthetic audio.
+
+    python -m loadtest.fake_live_server --port 9100 --first-audio-ms 400 --turn-seconds 3
+    GEMINI_LIVE_URL=ws://localhost:9100 python main.py
+
+It speaks the Live JSON protocol the SDK session uses: ``setup`` is answered
+with ``setupComplete``, and a model turn starts when the client ends a turn
+(``clientContent`` with ``turnComplete``) or ends its audio stream
+(``realtimeInput.audioStreamEnd``) after sending audio. A turn is
+``--first-audio-ms`` of silence, then ``--turn-seconds`` of 24 kHz 16-bit PCM
+in ``--chunk-ms`` chunks paced at real time (or as fast as possible with
+``--no-pacing``), then ``turnComplete``. A new turn from the client
+interrupts the one being streamed.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+
+import numpy as np
+import websockets
+
+from config.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 24000
+MIME_TYPE = f"audio/pcm;rate={SAMPLE_RATE}"
+
+
+def synthetic_turn(seconds, chunk_ms, frequency=220.0):
+    """Pre-encoded serverContent messages carrying a faded sine tone"""
+    samples = int(SAMPLE_RATE * seconds)
+    t = np.arange(samples) / SAMPLE_RATE
+    envelope = np.minimum(1.0, np.minimum(t, seconds - t) / 0.05)  # 50 ms fade in and out
+    pcm = (0.3 * 32767 * envelope * np.sin(2 * np.pi * frequency * t)).astype("<i2").tobytes()
+
+    chunk_bytes = int(SAMPLE_RATE * chunk_ms / 1000) * 2
+    return [
+        json.dumps({"serverContent": {"modelTurn": {"parts": [{"inlineData": {
+            "mimeType": MIME_TYPE,
+            "data": base64.b64encode(pcm[offset:offset + chunk_bytes]).decode("ascii"),
+        }}]}}})
+        for offset in range(0, len(pcm), chunk_bytes)
+    ]
+
+
+def field(message, name, alias=None, default=None):
+    """Read a field by its JSON name or snake_case alias; SDK versions and methods differ"""
+    if name in message:
+        return message[name]
+    return message.get(alias, default) if alias else default
+
+
+class FakeLiveServer:
+    def __init__(self, setup_ms, first_audio_ms, turn_seconds, chunk_ms, pacing=True):
+        self.setup_delay = setup_ms / 1000
+        self.first_audio_delay = first_audio_ms / 1000
+        self.chunk_delay = chunk_ms / 1000 if pacing else 0
+        self.turn = synthetic_turn(turn_seconds, chunk_ms)
+        self.connections = 0
+        self.turns = 0
+        self.interruptions = 0
+
+    async def handle(self, websocket):
+        message = json.loads(await websocket.recv())
+        if "setup" not in message:
+            await websocket.close(1007, "expected setup")
+            return
+        await asyncio.sleep(self.setup_delay)
+        await websocket.send(json.dumps({"setupComplete": {}}))
+        self.connections += 1
+
+        reply = None
+        heard_audio = False
+        try:
+            async for raw in websocket:
+                message = json.loads(raw)
+                turn_ended = False
+                if client_content := field(message, "clientContent", "client_content"):
+                    turn_ended = field(client_content, "turnComplete", "turn_complete", False)
+                elif realtime_input := field(message, "realtimeInput", "realtime_input"):
+                    if field(realtime_input, "audio") or field(realtime_input, "mediaChunks", "media_chunks"):
+                        heard_audio = True
+                    if field(realtime_input, "audioStreamEnd", "audio_stream_end") and heard_audio:
+                        turn_ended = True
+                if not turn_ended:
+                    continue
+
+                heard_audio = False
+                if reply is not None and not reply.done():
+                    reply.cancel()
+                    self.interruptions += 1
+                    await websocket.send(json.dumps({"serverContent": {"interrupted": True}}))
+                reply = asyncio.create_task(self.model_turn(websocket))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if reply is not None:
+                reply.cancel()
+            self.connections -= 1
+
+    async def model_turn(self, websocket):
+        self.turns += 1
+        await asyncio.sleep(self.first_audio_delay)
+        for chunk in self.turn:
+            await websocket.send(chunk)
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+        await websocket.send(json.dumps({"serverContent": {"turnComplete": True}}))
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            logger.info("Fake Live server", extra={
+                "connections": self.connections, "turns": self.turns, "interruptions": self.interruptions,
+            })
+
+
+async def serve(args):
+    fake = FakeLiveServer(args.setup_ms, args.first_audio_ms, args.turn_seconds, args.chunk_ms,
+                          pacing=not args.no_pacing)
+    async with websockets.serve(fake.handle, args.host, args.port, max_size=None):
+        logger.info("Fake Live server on ws://%s:%s", args.host, args.port)
+        await fake.report(args.report_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--setup-ms", type=float, default=150, help="delay before setupComplete")
+    parser.add_argument("--first-audio-ms", type=float, default=400, help="delay before a turn's first audio")
+    parser.add_argument("--turn-seconds", type=float, default=3.0, help="audio per model turn")
+    parser.add_argument("--chunk-ms", type=float, default=40, help="audio per serverContent message")
+    parser.add_argument("--no-pacing", action="store_true", help="send a turn's chunks back to back")
+    parser.add_argument("--report-seconds", type=float, default=10, help="interval between stats log lines")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""OpenAI-compatible stand-in for /v1/chat/completions with canned interview payloads.
+
+    python -m loadtest.fake_openai_server --port 9200 --latency-ms 800
+    OPENAI_BASE_URL=http://localhost:9200/v1 python main.py
+
+Resume analysis requests get a fixed analysis; question requests get as many
+questions as the prompt asks for. Each response is delayed to mimic model latency.
+With --rate-limit, that fraction of requests is refused with a 429 and a
+Retry-After header, as the real API does when a quota is exhausted.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from loadtest.payloads import sample_analysis, sample_questions
+
+QUESTION_COUNT = re.compile(r"Generate exactly (\d+) questions")
+
+app = FastAPI()
+app.state.latency = 0.8
+app.state.jitter = 0.2
+app.state.requests = 0
+app.state.rate_limit = 0.0
+app.state.retry_after = 1.0
+app.state.rate_limited = 0
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    app.state.requests += 1
+
+    if random.random() < app.state.rate_limit:
+        app.state.rate_limited += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": str(app.state.retry_after)},
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+        )
+
+    if prompt.startswith("Analyze this resume"):
+        payload = sample_analysis()
+    else:
+        match = QUESTION_COUNT.search(prompt)
+        payload = sample_questions(int(match.group(1)) if match else 10)
+    content = json.dumps(payload)
+
+    await asyncio.sleep(app.state.latency + random.uniform(0, app.state.jitter))
+
+    prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+    completion_tokens = len(content) // 4
+    return JSONResponse(content={
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    })
+
+
+@app.get("/stats")
+async def stats():
+    return {"requests": app.state.requests, "rate_limited": app.state.rate_limited}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency-ms", type=float, default=800, help="fixed delay before each response")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="extra uniform random delay")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with each 429")
+    args = parser.parse_args()
+
+    app.state.latency = args.latency_ms / 1000
+    app.state.jitter = args.jitter_ms / 1000
+    app.state.rate_limit = args.rate_limit
+    app.state.retry_after = args.retry_after
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""In-memory stand-in for Redis, enough to run the redis:// session store locally.
+
+    python -m loadtest.fake_redis_server --port 6390
+    SESSION_STORE_URL=redis://localhost:6390/0 python main.py --workers 4
+
+It speaks RESP2, plus the RESP3 map that answers ``HELLO 3``, and implements
+the commands the store and redis-py's connection setup use: HELLO, PING,
+ECHO, SELECT, CLIENT, GET, GETEX, SET (EX/PX), DEL, EXISTS, EXPIRE, TTL,
+SCAN (MATCH/COUNT), DBSIZE and FLUSHDB. Keys expire lazily when read and in
+a periodic sweep. All databases share one keyspace.
+"""
+import argparse
+import asyncio
+import fnmatch
+import logging
+import time
+
+from config.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+class CommandError(Exception):
+    pass
+
+
+def encode(value, resp3=False):
+    """RESP encoding of a reply; RESP3 differs only in its null and map types"""
+    if value is None:
+        return b"_\r\n" if resp3 else b"$-1\r\n"
+    if isinstance(value, CommandError):
+        return f"-ERR {value}\r\n".encode()
+    if isinstance(value, bool):
+        return b"+OK\r\n"
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, dict):
+        return b"%%%d\r\n" % len(value) + b"".join(encode(k, resp3) + encode(v, resp3) for k, v in value.items())
+    return b"*%d\r\n" % len(value) + b"".join(encode(item, resp3) for item in value)
+
+
+async def read_command(reader):
+    """One command as a list of bytes arguments, or None at EOF"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()  # inline command, e.g. from telnet
+    arguments = []
+    for _ in range(int(line[1:])):
+        length = int((await reader.readline())[1:])
+        arguments.append((await reader.readexactly(length + 2))[:-2])
+    return arguments
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.commands = 0
+
+    def _live(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def _set_expiry(self, key, options):
+        """Apply EX/PX/PERSIST options given as (name, value) pairs"""
+        for name, value in options:
+            if name == b"EX":
+                self.expires[key] = time.time() + int(value)
+            elif name == b"PX":
+                self.expires[key] = time.time() + int(value) / 1000
+            elif name == b"PERSIST":
+                self.expires.pop(key, None)
+
+    @staticmethod
+    def _options(arguments):
+        options, index = [], 0
+        while index < len(arguments):
+            name = arguments[index].upper()
+            if name in (b"EX", b"PX"):
+                options.append((name, arguments[index + 1]))
+                index += 2
+            else:
+                options.append((name, None))
+                index += 1
+        return options
+
+    def execute(self, arguments):
+        self.commands += 1
+        name, arguments = arguments[0].upper().decode(), arguments[1:]
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return CommandError(f"unknown command '{name}'")
+        try:
+            return handler(*arguments)
+        except (TypeError, ValueError, IndexError):
+            return CommandError(f"wrong arguments for '{name}' command")
+
+    def cmd_hello(self, version=b"2", *arguments):
+        info = {"server": "redis", "version": "7.2.0", "proto": int(version), "mode": "standalone"}
+        if version == b"3":
+            return info
+        return [item for pair in info.items() for item in pair]
+
+    def cmd_ping(self, message=None):
+        return message if message is not None else "PONG"
+
+    def cmd_echo(self, message):
+        return message
+
+    def cmd_select(self, index):
+        int(index)
+        return True
+
+    def cmd_client(self, *arguments):
+        return True
+
+    def cmd_get(self, key):
+        return self.data[key] if self._live(key) else None
+
+    def cmd_getex(self, key, *arguments):
+        if not self._live(key):
+            return None
+        self._set_expiry(key, self._options(arguments))
+        return self.data[key]
+
+    def cmd_set(self, key, value, *arguments):
+        self.data[key] = value
+        self.expires.pop(key, None)
+        self._set_expiry(key, self._options(arguments))
+        return True
+
+    def cmd_del(self, *keys):
+        removed = sum(1 for key in keys if self._live(key))
+        for key in keys:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return removed
+
+    def cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._live(key))
+
+    def cmd_expire(self, key, seconds):
+        if not self._live(key):
+            return 0
+        self.expires[key] = time.time() + int(seconds)
+        return 1
+
+    def cmd_ttl(self, key):
+        if not self._live(key):
+            return -2
+        expires_at = self.expires.get(key)
+        return -1 if expires_at is None else max(0, round(expires_at - time.time()))
+
+    def cmd_scan(self, cursor, *arguments):
+        pattern, count = b"*", 10
+        for index in range(0, len(arguments), 2):
+            if arguments[index].upper() == b"MATCH":
+                pattern = arguments[index + 1]
+            elif arguments[index].upper() == b"COUNT":
+                count = int(arguments[index + 1])
+        keys = sorted(key for key in list(self.data) if self._live(key))
+        start = int(cursor)
+        page = keys[start:start + count]
+        following = start + count if start + count < len(keys) else 0
+        matched = [key for key in page if fnmatch.fnmatchcase(key.decode(), pattern.decode())]
+        return [str(following).encode(), matched]
+
+    def cmd_dbsize(self):
+        return sum(1 for key in list(self.data) if self._live(key))
+
+    def cmd_flushdb(self, *arguments):
+        self.data.clear()
+        self.expires.clear()
+        return True
+
+    def sweep(self):
+        for key in list(self.expires):
+            self._live(key)
+
+    async def handle(self, reader, writer):
+        resp3 = False
+        try:
+            while (arguments := await read_command(reader)) is not None:
+                if arguments:
+                    reply = self.execute(arguments)
+                    if arguments[0].upper() == b"HELLO" and isinstance(reply, dict):
+                        resp3 = True
+                    writer.write(encode(reply, resp3))
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+            logger.info("Fake Redis server", extra={"keys": len(self.data), "commands": self.commands})
+
+
+async def serve(args):
+    fake = FakeRedis()
+    server = await asyncio.start_server(fake.handle, args.host, args.port)
+    async with server:
+        logger.info("Fake Redis server on redis://%s:%s", args.host, args.port)
+        await fake.report(args.report_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6390)
+    parser.add_argument("--report-seconds", type=float, default=10, help="interval between stats log lines")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Ramp up concurrent synthetic candidates and report how the server holds up.
+
+    python -m loadtest.fake_live_server &
+    python -m loadtest.fake_openai_server &
+    GEMINI_LIVE_URL=ws://localhost:9100 OPENAI_BASE_URL=http://localhost:9200/v1 python main.py &
+    python -m loadtest.load_generator --levels 1,5,10,25 --duration 60
+
+Every candidate uploads a resume and JD, opens the interview websocket, waits
+for ``ready`` and then alternates ``--speak-seconds`` of 16 kHz PCM with
+``--pause-seconds`` of silence, sent in ``--chunk-ms`` chunks at real-time
+pace. For each concurrency level the report gives turn latency percentiles
+(end of the candidate's speech to the first response audio), frames the
+client could not send on time, frames the server shed, and CPU and resident
+memory per session taken from the server's /metrics.
+
+Without ``--ws`` the websocket is the standalone port 8765 of a single-worker
+server, or /ws on the ``--http`` port when the server runs several workers.
+Each /metrics scrape then covers only the worker that answers it, so CPU and
+memory per session are left out of the report.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import re
+import statistics
+import time
+import wave
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+import websockets
+
+from services.audio_protocol import PROTOCOL_BINARY, PROTOCOL_JSON, PROTOCOLS, FRAME_AUDIO, pack_audio_frame, unpack_frame
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_RATE = 16000
+METRIC_LINE = re.compile(r"^([a-zA-Z_:][\w:]*)(\{[^}]*\})? (\S+)$")
+
+
+def load_pcm(path):
+    """16 kHz mono 16-bit PCM from a .wav file or a headerless .pcm/.raw file"""
+    path = Path(path)
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as wav:
+            if wav.getframerate() != SAMPLE_RATE or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+                raise ValueError(f"{path} must be 16 kHz mono 16-bit PCM")
+            return wav.readframes(wav.getnframes())
+    return path.read_bytes()
+
+
+def synthetic_speech(seconds):
+    """Voiced, syllable-modulated harmonics: loud enough and low enough in
+    zero crossings for the server's VAD to treat it as speech"""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    pitch = 140 + 20 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+    return (0.25 * 32767 * syllables * voiced / 2.3).astype("<i2").tobytes()
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def scrape_metrics(base_url):
+    """Sum of each metric's samples across labels, from the Prometheus text format"""
+    totals = {}
+    for line in requests.get(f"{base_url}/metrics", timeout=10).text.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            totals[match.group(1)] = totals.get(match.group(1), 0.0) + float(match.group(3))
+    return totals
+
+
+def websocket_url(http_url, workers):
+    """Default interview websocket of the server at http_url"""
+    parts = urlsplit(http_url)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    if workers > 1:
+        # The standalone websocket server only runs in single-worker mode
+        return f"{scheme}://{parts.netloc}/ws"
+    return f"{scheme}://{parts.hostname}:8765"
+
+
+class CandidateResult:
+    def __init__(self):
+        self.turn_latencies = []
+        self.greeting = None
+        self.frames_sent = 0
+        self.frames_late = 0
+        self.audio_bytes_received = 0
+        self.turns_completed = 0
+        self.error = None
+
+
+class SyntheticCandidate:
+    def __init__(self, args, speech, index):
+        self.args = args
+        self.speech = speech
+        self.name = f"Candidate{index}"
+        self.result = CandidateResult()
+        self.chunk_bytes = int(SAMPLE_RATE * args.chunk_ms / 1000) * 2
+        self.speech_ended_at = None
+        # True while a response that started before the candidate finished speaking is still streaming
+        self.previous_response_open = False
+        self.responding = False
+        self.sequence = 0
+        self.ended = asyncio.Event()
+
+    def upload(self):
+        """Upload resume and JD; returns the session ID"""
+        session_id = None
+        for kind, path in (("resume", self.args.resume), ("jd", self.args.jd)):
+            with open(path, "rb") as handle:
+                files = {"file": (Path(path).name, handle, "application/pdf")}
+                params = {"session_id": session_id} if session_id else {}
+                response = requests.post(f"{self.args.http}/upload/{kind}", files=files, params=params, timeout=60)
+            response.raise_for_status()
+            session_id = response.json()["session_id"]
+        return session_id
+
+    async def run(self, duration):
+        try:
+            session_id = await asyncio.to_thread(self.upload)
+            url = (f"{self.args.ws}?name={self.name}&gain={self.args.gain}&session_id={session_id}"
+                   f"&protocol={self.args.protocol}")
+            connected_at = time.monotonic()
+            async with websockets.connect(url, max_size=None) as websocket:
+                await self.wait_until_ready(websocket)
+                receiver = asyncio.create_task(self.receive(websocket, connected_at))
+                try:
+                    await self.stream(websocket, duration)
+                    await websocket.send(json.dumps({"text": "q"}))
+                    await asyncio.wait_for(self.ended.wait(), 5)
+                finally:
+                    receiver.cancel()
+                    await asyncio.gather(receiver, return_exceptions=True)
+        except Exception as e:
+            self.result.error = f"{type(e).__name__}: {e}"
+        return self.result
+
+    async def wait_until_ready(self, websocket):
+        async for message in websocket:
+            if isinstance(message, str):
+                data = json.loads(message)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                if data.get("status") == "ready":
+                    return
+        raise ConnectionError("websocket closed before ready")
+
+    def encode(self, pcm):
+        if self.args.protocol == PROTOCOL_BINARY:
+            frame = pack_audio_frame(self.sequence, pcm)
+        else:
+            frame = json.dumps({"audio": base64.b64encode(pcm).decode("ascii")})
+        self.sequence += 1
+        return frame
+
+    async def stream(self, websocket, duration):
+        """Send speak/pause cycles at real-time pace until duration has passed"""
+        chunk_seconds = self.args.chunk_ms / 1000
+        silence = bytes(self.chunk_bytes)
+        speech_chunks = max(1, int(self.args.speak_seconds / chunk_seconds))
+        pause_chunks = max(1, int(self.args.pause_seconds / chunk_seconds))
+        offset = 0
+
+        started = time.monotonic()
+        next_send = started
+        while time.monotonic() - started < duration:
+            for index in range(speech_chunks + pause_chunks):
+                speaking = index < speech_chunks
+                if speaking:
+                    if offset + self.chunk_bytes > len(self.speech):
+                        offset = 0
+                    pcm = self.speech[offset:offset + self.chunk_bytes]
+                    offset += self.chunk_bytes
+                else:
+                    pcm = silence
+
+                now = time.monotonic()
+                if now < next_send:
+                    await asyncio.sleep(next_send - now)
+                elif now - next_send > chunk_seconds:
+                    self.result.frames_late += 1  # the event loop could not keep real-time pace
+                await websocket.send(self.encode(pcm))
+                self.result.frames_sent += 1
+                next_send += chunk_seconds
+                if index == speech_chunks - 1:
+                    self.speech_ended_at = time.monotonic()
+                    self.previous_response_open = self.responding
+
+    async def receive(self, websocket, connected_at):
+        async for message in websocket:
+            if isinstance(message, bytes):
+                frame_type, _sequence, payload = unpack_frame(message)
+                if frame_type == FRAME_AUDIO:
+                    self.on_audio(len(payload), connected_at)
+                continue
+            data = json.loads(message)
+            if "audio" in data:
+                self.on_audio(len(data["audio"]) * 3 // 4, connected_at)
+            if data.get("command") == "session_ended":
+                self.ended.set()
+            if data.get("turn_complete"):
+                self.result.turns_completed += 1
+                self.responding = False
+                self.previous_response_open = False
+
+    def on_audio(self, size, connected_at):
+        now = time.monotonic()
+        self.result.audio_bytes_received += size
+        self.responding = True
+        if self.result.greeting is None:
+            self.result.greeting = now - connected_at
+        if self.speech_ended_at is not None and not self.previous_response_open:
+            self.result.turn_latencies.append(now - self.speech_ended_at)
+            self.speech_ended_at = None
+
+
+async def run_level(args, speech, concurrency):
+    before = await asyncio.to_thread(scrape_metrics, args.http)
+    started = time.monotonic()
+    candidates = [SyntheticCandidate(args, speech, index) for index in range(concurrency)]
+    tasks = []
+    for candidate in candidates:
+        tasks.append(asyncio.create_task(candidate.run(args.duration)))
+        await asyncio.sleep(args.spawn_interval)
+    results = await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+    after = await asyncio.to_thread(scrape_metrics, args.http)
+    return summarize(args, concurrency, results, before, after, elapsed)
+
+
+def summarize(args, concurrency, results, before, after, elapsed):
+    def delta(name):
+        return after.get(name, 0.0) - before.get(name, 0.0)
+
+    latencies = [latency for result in results for latency in result.turn_latencies]
+    greetings = [result.greeting for result in results if result.greeting is not None]
+    frames_sent = sum(result.frames_sent for result in results)
+    chunk_bytes = int(SAMPLE_RATE * args.chunk_ms / 1000) * 2
+
+    def ms(value):
+        return round(value * 1000, 1) if value is not None else None
+
+    # Process metrics of one worker out of several say nothing about a session's cost
+    workers = int(after.get("interview_web_workers", 1))
+    whole_server = workers == 1
+    return {
+        "concurrency": concurrency,
+        "workers": workers,
+        "errors": [result.error for result in results if result.error],
+        "turns": len(latencies),
+        "turn_latency_ms": {f"p{q}": ms(percentile(latencies, q)) for q in (50, 95, 99)},
+        "greeting_ms_p50": ms(statistics.median(greetings)) if greetings else None,
+        "frames_sent": frames_sent,
+        "frames_late": sum(result.frames_late for result in results),
+        "frames_dropped_server": round(delta("interview_audio_dropped_bytes_total") / chunk_bytes),
+        "cpu_percent_per_session": round(
+            100 * delta("process_cpu_seconds_total") / elapsed / concurrency, 2) if whole_server else None,
+        "rss_mb_per_session": round(
+            (after.get("process_resident_memory_bytes", 0.0) - before.get("process_resident_memory_bytes", 0.0))
+            / concurrency / 2 ** 20, 2) if whole_server else None,
+        "rss_mb": round(after.get("process_resident_memory_bytes", 0.0) / 2 ** 20, 1) if whole_server else None,
+    }
+
+
+def print_report(rows):
+    header = (f"{'sessions':>8} {'turns':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'greet ms':>9} "
+              f"{'late':>6} {'dropped':>8} {'cpu%/s':>7} {'MB/s':>6} {'rss MB':>7} {'errors':>6}")
+    print(header)
+    for row in rows:
+        latency = row["turn_latency_ms"]
+        print(f"{row['concurrency']:>8} {row['turns']:>6} {latency['p50'] or '-':>8} {latency['p95'] or '-':>8} "
+              f"{latency['p99'] or '-':>8} {row['greeting_ms_p50'] or '-':>9} {row['frames_late']:>6} "
+              f"{row['frames_dropped_server']:>8} {row['cpu_percent_per_session'] or '-':>7} "
+              f"{row['rss_mb_per_session'] or '-':>6} {row['rss_mb'] or '-':>7} {len(row['errors']):>6}")
+        if row["workers"] > 1:
+            print(f"{'':>8} cpu and memory not reported: /metrics covers one of {row['workers']} workers")
+        for error in sorted(set(row["errors"])):
+            print(f"{'':>8} error: {error}")
+
+
+async def main_async(args):
+    if args.ws is None:
+        workers = int((await asyncio.to_thread(scrape_metrics, args.http)).get("interview_web_workers", 1))
+        args.ws = websocket_url(args.http, workers)
+    speech = load_pcm(args.audio) if args.audio else synthetic_speech(10)
+    rows = []
+    for concurrency in args.levels:
+        rows.append(await run_level(args, speech, concurrency))
+        print_report(rows[-1:])
+    print()
+    print_report(rows)
+    if args.output:
+        Path(args.output).write_text(json.dumps(rows, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--http", default="http://localhost:8000", help="FastAPI base URL")
+    parser.add_argument("--ws", help="interview websocket URL (default: derived from --http and the worker count)")
+    parser.add_argument("--resume", default=str(REPO_ROOT / "temp/resume/Siddharth_Verma_SDE_2.pdf"))
+    parser.add_argument("--jd", default=str(REPO_ROOT / "temp/jd/JD-Valuebound.pdf"))
+    parser.add_argument("--audio", help="recorded 16 kHz mono PCM (.wav or raw); synthetic speech if omitted")
+    parser.add_argument("--levels", default="1,5,10", type=lambda value: [int(n) for n in value.split(",")],
+                        help="comma-separated concurrency levels, run in order")
+    parser.add_argument("--duration", type=float, default=30, help="seconds each candidate streams per level")
+    parser.add_argument("--spawn-interval", type=float, default=0.05, help="delay between starting candidates")
+    parser.add_argument("--speak-seconds", type=float, default=3)
+    parser.add_argument("--pause-seconds", type=float, default=5)
+    parser.add_argument("--chunk-ms", type=float, default=20)
+    parser.add_argument("--gain", type=float, default=1.0)
+    parser.add_argument("--protocol", choices=PROTOCOLS, default=PROTOCOL_JSON)
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Canned OpenAI responses in the shapes ResumeAnalyzer asks for."""
+import copy
+
+
+ANALYSIS = {
+    "candidate_overview": {
+        "total_years_experience": 3,
+        "current_role": "Software Engineer",
+        "current_company": "Acme Payments",
+        "current_tenure": "1 year 8 months",
+    },
+    "career_progression": ["Software Engineer Intern", "Associate Software Engineer", "Software Engineer"],
+    "employment_history": [
+        {
+            "company": "Acme Payments",
+            "role": "Software Engineer",
+            "period": "01/2023 - Present",
+            "duration": "1 year 8 months",
+            "achievements": ["Cut checkout API p99 latency by 40%", "Led migration of ledger jobs to Kafka"],
+        },
+        {
+            "company": "Globex",
+            "role": "Associate Software Engineer",
+            "period": "07/2021 - 12/2022",
+            "duration": "1 year 6 months",
+            "achievements": ["Built an internal feature-flag service used by 12 teams"],
+        },
+    ],
+    "notable_achievements": [
+        {"company": "Acme Payments", "role": "Software Engineer",
+         "achievement": "Reduced payment failures by 15% through idempotent retries"},
+    ],
+    "key_projects": [
+        {
+            "name": "Ledger streaming",
+            "duration": "6 months",
+            "scope": "4 engineers, 3 downstream teams",
+            "contribution": "Designed the consumer and reconciliation jobs",
+            "impact": "Settlement reports available hourly instead of daily",
+        },
+    ],
+    "validated_skills": {
+        "technical": ["Python", "Java", "PostgreSQL", "Kafka", "Docker", "AWS"],
+        "functional": ["Payments", "Distributed systems"],
+        "leadership": ["Mentoring interns"],
+    },
+    "unverified_skills": ["Kubernetes", "GraphQL"],
+    "green_flags": {
+        "experience_strengths": [
+            {"type": "CAREER_PROGRESSION", "details": "Two promotions in three years", "relevance": "HIGH",
+             "interview_question": "What changed in your responsibilities after each promotion?"},
+        ],
+        "skill_mastery": [
+            {"type": "TECHNICAL_DEPTH", "details": "Kafka consumer design", "relevance": "HIGH",
+             "interview_question": "How did you guarantee exactly-once processing in the ledger pipeline?"},
+        ],
+        "achievement_highlights": [
+            {"type": "IMPACT", "details": "40% latency reduction", "relevance": "MEDIUM",
+             "interview_question": "Walk me through how you found the latency bottleneck."},
+        ],
+        "cultural_fit": [],
+        "certifications": [],
+    },
+    "red_flags": {
+        "employment_concerns": [
+            {"type": "GAP", "details": "Six month gap in 2021", "severity": "LOW",
+             "interview_question": "What were you focused on during the first half of 2021?"},
+        ],
+        "skill_concerns": [
+            {"type": "OVERCLAIMED", "details": "Kubernetes listed without project evidence", "severity": "MEDIUM",
+             "interview_question": "Where have you operated Kubernetes in production?"},
+        ],
+    },
+}
+
+QUESTION_TYPES = ("coding_scenario", "database_query", "fundamental", "project_experience", "practical_scenario")
+
+
+def sample_analysis():
+    return copy.deepcopy(ANALYSIS)
+
+
+def sample_questions(count):
+    """A question set with ``count`` entries, cycling through the question types"""
+    questions = []
+    for index in range(count):
+        question_type = QUESTION_TYPES[index % len(QUESTION_TYPES)]
+        questions.append({
+            "question_text": f"Synthetic {question_type.replace('_', ' ')} question {index + 1}: "
+                             "describe how you would design a rate limiter for a payments API.",
+            "question_type": question_type,
+            "red_flag_category": None,
+            "experience_level": "JUNIOR",
+            "skill_assessed": "System design",
+            "context": "Candidate built latency-sensitive payment services",
+            "follow_ups": ["What are the trade-offs?", "How would you test it?"],
+            "estimated_time": "3",
+            "evaluation_criteria": {
+                "excellent": "Explains token bucket vs sliding window and their failure modes",
+                "acceptable": "Proposes a working approach",
+                "poor": "No coherent approach",
+            },
+        })
+    return {"questions": questions}
@@ -1,19 +1,45 @@
+import argparse
 import asyncio
-import traceback
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 import uvicorn
 from dotenv import load_dotenv
-from routes.web_sockets import websocket_server
+from routes.web_sockets import websocket_server, router as interview_router
 from fastapi.middleware.cors import CORSMiddleware
 from routes.uploads import router as uploads_router
+from routes.cache import router as cache_router
+from routes.prompts import router as prompts_router
+from config.logging_config import setup_logging
+from services.metrics import render_metrics
+from services.live_session_pool import live_session_pool
+from config.config import WEB_WORKERS
 
 load_dotenv()
+setup_logging()
+
+logger = logging.getLogger(__name__)
 
 # Audio settings
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Each worker process keeps its own pool of warm Live sessions
+    await live_session_pool.start()
+    try:
+        yield
+    finally:
+        await live_session_pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(interview_router)
 app.include_router(uploads_router)
+app.include_router(cache_router)
+app.include_router(prompts_router)
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -24,8 +50,14 @@ app.add_middleware(
 )
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint; with several workers, each scrape sees only the worker that answers it"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 async def main():
-    print("\n=== Starting AI Interviewer Server ===")
+    logger.info("Starting AI Interviewer Server")
     
     # Run both FastAPI and WebSocket server
     config = uvicorn.Config(
@@ -37,9 +69,7 @@ async def main():
     )
     server = uvicorn.Server(config)
     
-    print("\n=== FastAPI Server Configuration ===")
-    print(f"Starting FastAPI server on http://0.0.0.0:8000")
-    print("===================================\n")
+    logger.info("Starting FastAPI server on http://0.0.0.0:8000")
     
     try:
         await asyncio.gather(
@@ -47,8 +77,31 @@ async def main():
             websocket_server()
         )
     except Exception as e:
-        print(f"Server error: {e}")
-        traceback.print_exc()
+        logger.exception("Server error: %s", e)
+
+def serve_workers(workers):
+    """Run ``workers`` uvicorn processes on port 8000; the interview websocket is at /ws.
+
+    Sessions are shared through the session store (SESSION_STORE_URL), so
+    an upload and the websocket that follows may land on different workers.
+    /metrics and /cache/stats report only the worker that answers the
+    request; interview_web_workers tells scrapers how many there are.
+    """
+    logger.info("Starting %d FastAPI workers on http://0.0.0.0:8000 (websocket at /ws)", workers)
+    # Workers import the API clients and PDF stack on start; on few cores, several doing so at
+    # once can take longer than uvicorn's default 5 s health check before it restarts them
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers, log_level="info",
+                timeout_worker_healthcheck=60)
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AI Interviewer server")
+    parser.add_argument("--workers", type=int, default=WEB_WORKERS,
+                        help="worker processes; more than one drops the standalone websocket port")
+    args = parser.parse_args()
+    # Inherited by the workers, which report it as interview_web_workers
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    if args.workers > 1:
+        serve_workers(args.workers)
+    else:
+        asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Prepare the interviews of a whole candidate manifest before the interview day.
+
+    python prepare_batch.py candidates.csv
+    python prepare_batch.py candidates.json --concurrency 16 --checkpoint day1.jsonl
+
+The manifest is a CSV with a header row, or a JSON list of objects, with the
+fields name, resume_path, jd_path and role (optional, default SD1); relative
+paths are read from the manifest's directory. Each candidate's resume is
+analyzed, questions generated and the final prompt rendered into the session
+store, so the interview starts as soon as the candidate connects to
+/ws?session_id=<id>&name=<name>.
+
+Every finished candidate is appended to the checkpoint file (default: the
+manifest path plus .checkpoint.jsonl) along with its session ID. Running the
+same command again after a crash or with failures only prepares what is left.
+The server must use the same SESSION_STORE_URL, which cannot be memory://.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from dotenv import load_dotenv
+
+# The services create their API clients on import
+load_dotenv()
+
+from config.config import BATCH_CONCURRENCY, BATCH_MAX_ATTEMPTS, BATCH_SESSION_TTL_SECONDS, SESSION_MEMORY_BUDGET_MB
+from config.logging_config import setup_logging
+from services.batch_prepare import BatchPreparer, Checkpoint, load_manifest
+from services.interview_state import SessionRegistry, analyzer
+from services.session_store import MemorySessionStore, session_store
+
+logger = logging.getLogger(__name__)
+
+
+async def main(args, candidates):
+    # BatchPreparer retries through its shared rate-limit gate; the SDK's own retries would
+    # ignore the gate and multiply the attempts
+    analyzer.client = analyzer.client.with_options(max_retries=0)
+    registry = SessionRegistry(
+        ttl=args.ttl,
+        memory_budget=SESSION_MEMORY_BUDGET_MB * 1024 * 1024,
+        store=session_store,
+    )
+    checkpoint = Checkpoint(args.checkpoint or f"{args.manifest}.checkpoint.jsonl")
+    try:
+        preparer = BatchPreparer(registry, checkpoint, args.concurrency, args.max_attempts)
+        pending = preparer.pending(candidates)
+        logger.info("Preparing %d of %d candidates, %d at a time",
+                    len(pending), len(candidates), args.concurrency)
+        await preparer.run(pending)
+    finally:
+        checkpoint.close()
+
+    entries = [checkpoint.entries[candidate.key] for candidate in candidates if candidate.key in checkpoint.entries]
+    print(f"{'name':<30} {'role':<6} {'status':<8} session_id")
+    for entry in entries:
+        print(f"{entry['name']:<30} {entry['role']:<6} {entry['status']:<8} {entry['session_id'] or entry.get('error')}")
+    failed = sum(1 for entry in entries if entry["status"] != "ready")
+    print(f"{len(entries) - failed} ready, {failed} failed; details in {checkpoint.path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="CSV or JSON candidate manifest")
+    parser.add_argument("--checkpoint", help="JSONL progress file; reruns skip the candidates it lists as ready")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="candidates prepared at once")
+    parser.add_argument("--max-attempts", type=int, default=BATCH_MAX_ATTEMPTS,
+                        help="attempts per candidate for rate-limited or transient API failures")
+    parser.add_argument("--ttl", type=int, default=BATCH_SESSION_TTL_SECONDS,
+                        help="seconds prepared sessions stay in the store until the candidate connects")
+    args = parser.parse_args()
+
+    setup_logging()
+    if isinstance(session_store, MemorySessionStore):
+        sys.exit("SESSION_STORE_URL is memory://, which the server cannot see; use sqlite:/// or redis://")
+    try:
+        candidates = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        sys.exit(str(e))
+    sys.exit(asyncio.run(main(args, candidates)))
@@ -0,0 +1,31 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services.gemini_script import analysis_cache, question_store, text_cache
+
+# Create router instance
+router = APIRouter(
+    prefix="/cache",
+    tags=["cache"]
+)
+
+@router.get("/stats")
+async def cache_stats():
+    """Hit counters of the worker that answers; entry counts of shared stores cover every worker"""
+    # Counting stored question sets queries the session store
+    questions = await asyncio.to_thread(question_store.stats)
+    return JSONResponse(content={
+        "analysis": analysis_cache.stats(),
+        "questions": questions,
+        "parsed_text": text_cache.stats(),
+    })
+
+@router.delete("/questions")
+async def invalidate_questions(resume_hash: Optional[str] = None, jd_hash: Optional[str] = None,
+                               role: Optional[str] = None, difficulty: Optional[str] = None):
+    """Drop stored question sets matching every given field (all of them if none given)"""
+    removed = await asyncio.to_thread(
+        question_store.invalidate, resume_hash, jd_hash, role, difficulty
+    )
+    return JSONResponse(content={"status": "success", "removed": removed})
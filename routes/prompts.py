@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services.interview_state import role_prompts
+
+# Create router instance
+router = APIRouter(
+    prefix="/prompts",
+    tags=["prompts"]
+)
+
+@router.get("/roles")
+async def prompt_roles():
+    await role_prompts.sync()
+    return JSONResponse(content={"roles": role_prompts.roles})
+
+@router.post("/reload")
+async def reload_prompts():
+    """Re-import services/prompts.py and services/final_prompt.py and rebuild the pre-rendered
+    role prompts on every worker.
+
+    This worker reloads at once; the others do before their next prompt.
+    Role personas, focus areas and interviewer details come from the question
+    generator in services/gemini_script.py and are only picked up on restart.
+    """
+    try:
+        roles = await role_prompts.publish_reload()
+    except (ValueError, KeyError, SyntaxError) as e:
+        # The previous templates stay in place when the edited prompt is invalid
+        return JSONResponse(status_code=400, content={"status": "error", "detail": str(e)})
+    return JSONResponse(content={"status": "success", "roles": roles})
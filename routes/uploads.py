@@ -1,7 +1,10 @@
-from fastapi import APIRouter, File, UploadFile
+from typing import Optional
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from config.config import TEMP_DIR
-from services.interview_state import interview_state
+from services.interview_state import session_registry
+from services.upload_store import save_upload, MultipartUpload, UploadRejected
+from config.logging_config import session_id_var
 
 # Create router instance
 router = APIRouter(
@@ -9,27 +12,53 @@ router = APIRouter(
     tags=["uploads"]
 )
 
-@router.post("/resume")
-async def upload_resume(file: UploadFile = File(...)):
-    try:
-        file_path = TEMP_DIR / "resume" / file.filename
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        interview_state.resume_path = file_path
-        return JSONResponse(content={"status": "success", "path": str(file_path)})
-    except Exception as e:
-        return JSONResponse(content={"status": "error", "message": str(e)}, status_code=500)
+# The body is parsed by MultipartUpload rather than FastAPI, so describe it for the docs
+UPLOAD_BODY = {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+    "type": "object",
+    "properties": {"file": {"type": "string", "format": "binary"}},
+    "required": ["file"],
+}}}}}
 
-@router.post("/jd")
-async def upload_jd(file: UploadFile = File(...)):
+def _unknown_session(session_id):
+    return JSONResponse(content={"status": "error", "message": f"Unknown session {session_id}"}, status_code=404)
+
+async def _upload(kind, request, session_id):
+    """Store an uploaded resume or JD and attach it to the session"""
     try:
-        file_path = TEMP_DIR / "jd" / file.filename
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        interview_state.jd_path = file_path
-        return JSONResponse(content={"status": "success", "path": str(file_path)})
+        state = None
+        if session_id is not None:
+            state = await session_registry.get(session_id)
+            if state is None:
+                return _unknown_session(session_id)
+            session_id_var.set(state.session_id)
+        # Streamed from the request body itself, so limits apply before it is all received
+        stored = await save_upload(MultipartUpload(request), TEMP_DIR / kind)
+        if state is None:
+            # Only uploads that passed validation start a session
+            state = await session_registry.create()
+            session_id_var.set(state.session_id)
+        setattr(state, f"{kind}_path", stored.path)
+        setattr(state, f"{kind}_hash", stored.sha256)
+        # Parse now, so the parsed-text cache already has it when the interview is prepared
+        await state.document_text(kind)
+        await session_registry.save(state)
+        return JSONResponse(content={
+            "status": "success",
+            "path": str(stored.path),
+            "session_id": state.session_id,
+            "sha256": stored.sha256,
+            "size": stored.size,
+            "deduplicated": stored.deduplicated,
+        })
+    except UploadRejected as e:
+        return JSONResponse(content={"status": "error", "message": str(e)}, status_code=e.status_code)
     except Exception as e:
         return JSONResponse(content={"status": "error", "message": str(e)}, status_code=500)
 
+@router.post("/resume", openapi_extra=UPLOAD_BODY)
+async def upload_resume(request: Request, session_id: Optional[str] = None):
+    return await _upload("resume", request, session_id)
+
+@router.post("/jd", openapi_extra=UPLOAD_BODY)
+async def upload_jd(request: Request, session_id: Optional[str] = None):
+    return await _upload("jd", request, session_id)
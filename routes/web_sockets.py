@@ -1,71 +1,144 @@
 # Modified websocket handler
+import asyncio
 import json
+import logging
 import os
+import time
+from urllib.parse import parse_qsl
 
 import websockets
+from fastapi import APIRouter, WebSocket
 
-from services.interview_state import interview_state
+from services.interview_state import session_registry
 from services.gemini_audio_socket_handler import GeminiAudioWebSocketHandler
+from services.audio_protocol import PROTOCOLS, PROTOCOL_JSON
+from services.live_connection import LiveConnection
+from services.live_session_pool import live_session_pool
+from services.websocket_adapter import StarletteWebSocketAdapter
+from config.config import LIVE_PRECONNECT, LIVE_CONNECT_RETRY_SECONDS
+from config.logging_config import session_id_var
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter(tags=["interview"])
+
+
+@router.websocket("/ws")
+async def interview_websocket(websocket: WebSocket):
+    """The interview websocket served by the FastAPI app, so it runs in every uvicorn worker"""
+    accepted_at = time.monotonic()
+    await websocket.accept()
+    adapter = StarletteWebSocketAdapter(websocket)
+    try:
+        await run_interview(adapter, dict(websocket.query_params), accepted_at)
+    finally:
+        await adapter.close()
 
 
 async def websocket_handler(websocket):
     """Handler for new WebSocket connections"""
-    print(f"New WebSocket connection from {websocket.remote_address}")
+    accepted_at = time.monotonic()
     
-    # Parse query parameters
-    query_params = {}
+    # Parse query parameters; names arrive URL-encoded ("Jane+Doe")
     path = websocket.request.path if hasattr(websocket, 'request') else ''
-    print(f"Path: {path}")
-    
-    if "?" in path:
-        base_path, query_string = path.split("?", 1)
-        for param in query_string.split("&"):
-            if "=" in param:
-                key, value = param.split("=", 1)
-                query_params[key] = value
-    
-    # Get gain parameter and candidate name
+    logger.debug("Path: %s", path)
+    query_params = dict(parse_qsl(path.partition("?")[2]))
+
+    await run_interview(websocket, query_params, accepted_at)
+
+
+async def run_interview(websocket, query_params, accepted_at):
+    """Prepare the session named in the query and stream the interview; shared by both servers"""
+    logger.info("New WebSocket connection from %s", websocket.remote_address)
+
+    # Get gain parameter, candidate name and the session created by the uploads
     gain = float(query_params.get("gain", 1.0))
     candidate_name = query_params.get("name")
+    session_id = query_params.get("session_id")
+    # Audio framing is negotiated at connect time; clients that don't ask get JSON/base64
+    protocol = query_params.get("protocol", PROTOCOL_JSON)
+    
+    if protocol not in PROTOCOLS:
+        await websocket.send(json.dumps({
+            "error": f"Unsupported protocol {protocol}; expected one of {', '.join(PROTOCOLS)}"
+        }))
+        return
     
     if not candidate_name:
         await websocket.send(json.dumps({
             "error": "Candidate name is required"
         }))
         return
-    
-    # Check if both files are uploaded
-    if not interview_state.resume_path or not interview_state.jd_path:
+
+    interview_state = await session_registry.get(session_id) if session_id else None
+    # Tags every log record of this connection, including its handler tasks
+    session_id_var.set(session_id)
+    if interview_state is None:
         await websocket.send(json.dumps({
-            "error": "Please upload both resume and JD before connecting"
+            "error": "Unknown or missing session_id; upload resume and JD first"
         }))
         return
     
-    # Prepare interview with candidate name
-    print(f"Preparing interview for {candidate_name}...")
-    success = await interview_state.prepare_interview(candidate_name)
-    if not success:
+    # Check if both files are uploaded
+    if not interview_state.resume_hash or not interview_state.jd_hash:
         await websocket.send(json.dumps({
-            "error": "Failed to prepare interview"
+            "error": "Please upload both resume and JD before connecting"
         }))
-    else:
-        await websocket.send(json.dumps({
-            "success": "Interview prepared successfully"
-        }))    
+        return
     
+    interview_state.connections += 1
+    connection = None
+    connect_task = None
+    try:
+        # Open the Live session while the interview is prepared, so the handshake
+        # overlaps the LLM calls instead of following them
+        # A warm session from the pool skips the handshake altogether
+        prepared = asyncio.Event()
+        connection = live_session_pool.acquire()
+        if connection is None and LIVE_PRECONNECT:
+            connection = LiveConnection()
+            connect_task = asyncio.create_task(connection.open_until(prepared, LIVE_CONNECT_RETRY_SECONDS))
+
+        # Prepare interview with candidate name
+        logger.info("Preparing interview for %s...", candidate_name)
+        try:
+            success = await interview_state.prepare_interview(candidate_name)
+        finally:
+            prepared.set()
+        if not success:
+            await websocket.send(json.dumps({
+                "error": "Failed to prepare interview"
+            }))
+        else:
+            await websocket.send(json.dumps({
+                "success": "Interview prepared successfully"
+            }))    
+        
+
+        # A connect still in flight is given until it finishes; if it failed, the handler connects itself
+        if connect_task is not None:
+            await connect_task
 
-    # Create handler with prepared prompt
-    handler = GeminiAudioWebSocketHandler(websocket, initial_prompt=interview_state.final_prompt, gain=gain)
-    await handler.run()
+        # Create handler with prepared prompt
+        handler = GeminiAudioWebSocketHandler(websocket, initial_prompt=interview_state.final_prompt, gain=gain,
+                                              protocol=protocol, connection=connection, accepted_at=accepted_at)
+        await handler.run()
+    finally:
+        if connect_task is not None and not connect_task.done():
+            connect_task.cancel()
+            await asyncio.gather(connect_task, return_exceptions=True)
+        if connection is not None:
+            await connection.close()  # no-op once the handler has closed it
+        interview_state.connections -= 1
+        await session_registry.get(session_id)  # restart the idle clock from disconnect
 
 async def websocket_server():
     host = os.environ.get("WEBSOCKET_HOST", "localhost")
     port = int(os.environ.get("WEBSOCKET_PORT", 8765))
     
-    print("\n=== WebSocket Server Configuration ===")
-    print(f"Starting WebSocket server on ws://{host}:{port}")
-    print("=====================================\n")
+    logger.info("Starting WebSocket server on ws://%s:%s", host, port)
     
     server = await websockets.serve(websocket_handler, host, port)
-    print(f"WebSocket server is running on ws://{host}:{port}")
-    await server.wait_closed()
\ No newline at end of file
+    logger.info("WebSocket server is running on ws://%s:%s", host, port)
+    await server.wait_closed()
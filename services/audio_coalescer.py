@@ -0,0 +1,59 @@
+import asyncio
+
+
+class AudioCoalescer:
+    """Batches queued client PCM chunks into larger upstream packets.
+
+    Chunks are taken from ``queue`` (items shaped like ``{"data": ...}``) and
+    concatenated until a packet holds ``target_ms`` of audio or ``flush_ms``
+    have passed since its first chunk arrived, whichever comes first, which
+    bounds the latency added by batching to ``flush_ms``. Chunks are never
+    split, so a chunk that alone exceeds the target is sent as its own packet.
+    """
+
+    def __init__(self, queue, sample_rate, target_ms=40, flush_ms=60, sample_width=2):
+        self.queue = queue
+        self.target_bytes = int(sample_rate * sample_width * target_ms / 1000)
+        self.flush_seconds = flush_ms / 1000
+
+        self.frames_in = 0
+        self.sends_out = 0
+        self.bytes_out = 0
+
+    async def next_packet(self):
+        """Wait for the next packet of PCM and return it as bytes"""
+        first = (await self.queue.get())["data"]
+        frames = 1
+        if len(first) >= self.target_bytes:
+            packet = bytes(first)
+        else:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.flush_seconds
+            buffer = bytearray(first)
+            while len(buffer) < self.target_bytes:
+                if self.queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self.queue.get_nowait()
+                buffer += item["data"]
+                frames += 1
+            packet = bytes(buffer)
+
+        self.frames_in += frames
+        self.sends_out += 1
+        self.bytes_out += len(packet)
+        return packet
+
+    def stats(self):
+        return {
+            "frames_in": self.frames_in,
+            "sends_out": self.sends_out,
+            "bytes_out": self.bytes_out,
+            "frames_per_send": self.frames_in / self.sends_out if self.sends_out else 0.0,
+        }
@@ -0,0 +1,42 @@
+import binascii
+
+import numpy as np
+
+INT16_MIN = np.iinfo(np.int16).min
+INT16_MAX = np.iinfo(np.int16).max
+
+
+class AudioIngest:
+    """Single-pass ingest of client PCM: decode once, then apply gain.
+
+    ``ingest`` accepts raw PCM (bytes, bytearray or a memoryview into a
+    binary websocket frame) and ``ingest_base64`` the payload of a legacy
+    JSON message. Both return a memoryview over 16-bit little-endian PCM.
+    With unity gain the input buffer is returned as-is; otherwise samples are
+    scaled through a reused float32 scratch buffer, clipped to the int16
+    range instead of wrapping around, and written back in place when the
+    buffer is writable or into a single new int16 array when it is not.
+    """
+
+    def __init__(self, gain=1.0):
+        self.gain = float(gain)
+        self._scratch = np.empty(0, dtype=np.float32)
+
+    def ingest(self, pcm):
+        view = memoryview(pcm)
+        if self.gain == 1.0:
+            return view
+
+        samples = np.frombuffer(view, dtype=np.int16)
+        if len(self._scratch) < len(samples):
+            self._scratch = np.empty(len(samples), dtype=np.float32)
+        scratch = self._scratch[:len(samples)]
+
+        np.multiply(samples, self.gain, out=scratch)
+        np.clip(scratch, INT16_MIN, INT16_MAX, out=scratch)
+        out = samples if samples.flags.writeable else np.empty_like(samples)
+        np.copyto(out, scratch, casting="unsafe")
+        return memoryview(out).cast("B")
+
+    def ingest_base64(self, data):
+        return self.ingest(binascii.a2b_base64(data))
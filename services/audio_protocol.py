@@ -0,0 +1,32 @@
+import struct
+
+# Wire protocols for the interview websocket. "json" carries audio as base64
+# inside JSON text frames; "binary" carries raw PCM in binary frames and keeps
+# JSON text frames for control messages only.
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+PROTOCOLS = (PROTOCOL_JSON, PROTOCOL_BINARY)
+
+# Binary frame layout: 1 byte frame type, 1 byte flags (reserved, 0),
+# 4 byte big-endian sequence number, followed by the payload.
+FRAME_HEADER = struct.Struct("!BBI")
+FRAME_AUDIO = 1
+
+SEQUENCE_MODULUS = 1 << 32
+
+
+def pack_audio_frame(sequence, pcm):
+    """Build a binary audio frame for the given PCM payload"""
+    return FRAME_HEADER.pack(FRAME_AUDIO, 0, sequence % SEQUENCE_MODULUS) + pcm
+
+
+def unpack_frame(message):
+    """Split a binary frame into (frame_type, sequence, payload).
+
+    The payload is a memoryview into ``message`` so no bytes are copied.
+    Raises ValueError if the frame is shorter than its header.
+    """
+    if len(message) < FRAME_HEADER.size:
+        raise ValueError(f"Binary frame too short: {len(message)} bytes")
+    frame_type, _flags, sequence = FRAME_HEADER.unpack_from(message)
+    return frame_type, sequence, memoryview(message)[FRAME_HEADER.size:]
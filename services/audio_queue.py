@@ -0,0 +1,91 @@
+import asyncio
+from collections import deque
+
+DROP_OLDEST = "drop_oldest"
+DROP_SILENCE = "drop_silence"
+POLICIES = (DROP_OLDEST, DROP_SILENCE)
+
+
+class AudioQueue:
+    """Bounded queue of upstream PCM chunks that sheds audio instead of growing.
+
+    Items are dicts with ``data`` (PCM) and optionally ``speech`` (False for
+    chunks the VAD forwarded only as hangover or pre-roll). The queue holds at
+    most ``max_bytes`` of PCM and at most ``max_latency_ms`` worth of audio,
+    which is the delay a newly queued chunk would see before going upstream.
+    ``put_nowait`` never blocks: when a cap is exceeded it drops the oldest
+    chunks, or with the ``drop_silence`` policy the oldest non-speech chunks
+    first. The exposed gauges are the current depth and the cumulative drops.
+    """
+
+    def __init__(self, sample_rate, max_bytes, max_latency_ms, policy=DROP_SILENCE, sample_width=2):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown audio queue policy {policy}; expected one of {', '.join(POLICIES)}")
+        self.policy = policy
+        self.bytes_per_ms = sample_rate * sample_width / 1000
+        self.max_bytes = min(max_bytes, int(max_latency_ms * self.bytes_per_ms))
+
+        self._items = deque()
+        self._not_empty = asyncio.Event()
+
+        self.depth_bytes = 0
+        self.dropped_bytes = 0
+        self.dropped_frames = 0
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    @property
+    def depth_ms(self):
+        return self.depth_bytes / self.bytes_per_ms
+
+    def put_nowait(self, item):
+        self._items.append(item)
+        self.depth_bytes += len(item["data"])
+        if self.depth_bytes > self.max_bytes:
+            self._shed()
+        self._not_empty.set()
+
+    def get_nowait(self):
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        self.depth_bytes -= len(item["data"])
+        return item
+
+    async def get(self):
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def _drop(self, item):
+        size = len(item["data"])
+        self.depth_bytes -= size
+        self.dropped_bytes += size
+        self.dropped_frames += 1
+
+    def _shed(self):
+        if self.policy == DROP_SILENCE:
+            kept = deque()
+            for item in self._items:
+                if self.depth_bytes > self.max_bytes and not item.get("speech", True):
+                    self._drop(item)
+                else:
+                    kept.append(item)
+            self._items = kept
+        # Always keep the newest chunk, even if it alone exceeds the cap
+        while self.depth_bytes > self.max_bytes and len(self._items) > 1:
+            self._drop(self._items.popleft())
+
+    def stats(self):
+        return {
+            "depth_frames": len(self._items),
+            "depth_bytes": self.depth_bytes,
+            "depth_ms": self.depth_ms,
+            "dropped_frames": self.dropped_frames,
+            "dropped_bytes": self.dropped_bytes,
+        }
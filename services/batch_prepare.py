@@ -0,0 +1,266 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+
+import openai
+
+from config.config import TEMP_DIR
+from config.logging_config import session_id_var
+from services.cache import content_key
+from services.interview_state import DEFAULT_ROLE, role_prompts
+from services.upload_store import save_upload
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 60
+
+
+class Candidate:
+    """One manifest row; ``key`` identifies it across runs of the same manifest"""
+
+    def __init__(self, name, resume_path, jd_path, role):
+        self.name = name
+        self.resume_path = resume_path
+        self.jd_path = jd_path
+        self.role = role
+        self.key = content_key(name, resume_path, jd_path, role)
+
+
+def load_manifest(path):
+    """Candidates of a CSV file with a header row, or of a JSON list of objects.
+
+    Each row has ``name``, ``resume_path``, ``jd_path`` and an optional
+    ``role`` (default SD1). Relative paths are taken from the manifest's
+    directory. Raises ValueError naming every invalid row.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        rows = json.loads(path.read_text())
+    else:
+        with open(path, newline="") as handle:
+            rows = list(csv.DictReader(handle))
+
+    candidates = []
+    problems = []
+    for number, row in enumerate(rows, start=1):
+        name = (row.get("name") or "").strip()
+        resume = (row.get("resume_path") or "").strip()
+        jd = (row.get("jd_path") or "").strip()
+        role = (row.get("role") or "").strip() or DEFAULT_ROLE
+        if not (name and resume and jd):
+            problems.append(f"row {number}: name, resume_path and jd_path are required")
+        elif role not in role_prompts.roles:
+            problems.append(f"row {number}: unknown role {role!r}")
+        else:
+            candidates.append(Candidate(name, str(path.parent / resume), str(path.parent / jd), role))
+    if problems:
+        raise ValueError("Invalid manifest:\n" + "\n".join(problems))
+    return candidates
+
+
+class Checkpoint:
+    """Append-only JSONL log of finished candidates, so a rerun continues where a crash left off.
+
+    Each line is written and fsynced as soon as a candidate finishes; the
+    last entry per candidate key wins, and a line torn by a crash is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        torn = False
+        if self.path.exists():
+            content = self.path.read_text()
+            torn = bool(content) and not content.endswith("\n")
+            for line in content.splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[entry["key"]] = entry
+        self._handle = open(self.path, "a")
+        if torn:
+            self._handle.write("\n")
+
+    def record(self, entry):
+        self.entries[entry["key"]] = entry
+        self._handle.write(json.dumps(entry) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self):
+        self._handle.close()
+
+
+class LocalPDF:
+    """A PDF on disk with the async read() of an UploadFile, so it can go through save_upload"""
+
+    def __init__(self, path):
+        self._handle = open(path, "rb")
+
+    async def read(self, size):
+        return await asyncio.to_thread(self._handle.read, size)
+
+    def close(self):
+        self._handle.close()
+
+
+class RateLimitGate:
+    """Pause shared by all workers: once any of them is rate limited, none starts an attempt early"""
+
+    def __init__(self):
+        self._resume_at = 0.0
+
+    def pause(self, seconds):
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def wait(self):
+        while (delay := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+
+def _causes(error):
+    """error and the exceptions it was raised from or while handling"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _retry_after(error):
+    """Seconds the API asked us to wait in its Retry-After headers, if any"""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # an HTTP date; fall back to backoff
+    return None
+
+
+def backoff(attempt):
+    """Exponential backoff with jitter, so workers limited together do not retry together"""
+    return min(MAX_BACKOFF_SECONDS, 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def retry_delay(error, attempt):
+    """(seconds to wait, rate limited) before retrying after error, or (None, False) if retrying cannot help"""
+    for cause in _causes(error):
+        if isinstance(cause, openai.RateLimitError):
+            if cause.code == "insufficient_quota":
+                return None, False  # out of credit, not out of rate
+            return _retry_after(cause) or backoff(attempt), True
+        if isinstance(cause, (openai.APIConnectionError, openai.InternalServerError)):
+            return backoff(attempt), False
+    return None, False
+
+
+class BatchPreparer:
+    """Prepares the interviews of a manifest ahead of time, ``concurrency`` candidates at once.
+
+    Each candidate gets a session in ``registry`` whose record, questions
+    and rendered prompt go to the shared store (parsed text and analysis to
+    the caches under TEMP_DIR/cache), so the candidate's websocket connect
+    (with the same name) finds the prompt ready. Rate-limited and transient API failures are retried up to
+    ``max_attempts`` times; a rate limit pauses every worker for the
+    Retry-After the API sent. Finished candidates are recorded in
+    ``checkpoint`` and skipped on the next run while their prompt is still
+    stored.
+    """
+
+    def __init__(self, registry, checkpoint, concurrency, max_attempts):
+        self.registry = registry
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.gate = RateLimitGate()
+        # One copy per document, however many candidates share it
+        self._documents = {}
+
+    def pending(self, candidates):
+        """Candidates not prepared by an earlier run, or whose prompt has since expired"""
+        pending = []
+        for candidate in candidates:
+            entry = self.checkpoint.entries.get(candidate.key)
+            if (entry is not None and entry["status"] == "ready"
+                    and self.registry.store.get(f"prompt:{entry['session_id']}") is not None):
+                continue
+            pending.append(candidate)
+        return pending
+
+    async def run(self, candidates):
+        queue = asyncio.Queue()
+        for candidate in dict((candidate.key, candidate) for candidate in candidates).values():
+            queue.put_nowait(candidate)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(min(self.concurrency, queue.qsize()))]
+        await asyncio.gather(*workers)
+
+    async def _worker(self, queue):
+        while not queue.empty():
+            candidate = queue.get_nowait()
+            self.checkpoint.record(await self.prepare_candidate(candidate))
+
+    async def _document(self, kind, path):
+        """Copy a manifest document into the upload directory once, as an upload of it would"""
+        if (kind, path) not in self._documents:
+            self._documents[kind, path] = asyncio.ensure_future(self._store_document(kind, path))
+        return await self._documents[kind, path]
+
+    @staticmethod
+    async def _store_document(kind, path):
+        source = LocalPDF(path)
+        try:
+            return await save_upload(source, TEMP_DIR / kind)
+        finally:
+            source.close()
+
+    async def _open_session(self, candidate):
+        resume = await self._document("resume", candidate.resume_path)
+        jd = await self._document("jd", candidate.jd_path)
+        state = await self.registry.create()
+        session_id_var.set(state.session_id)
+        state.resume_path, state.resume_hash = resume.path, resume.sha256
+        state.jd_path, state.jd_hash = jd.path, jd.sha256
+        state.role = candidate.role
+        await state.document_text("resume")
+        await state.document_text("jd")
+        await self.registry.save(state)
+        return state
+
+    async def prepare_candidate(self, candidate):
+        """Prepare one candidate's interview, retrying what a retry can fix; returns its checkpoint entry"""
+        entry = {"key": candidate.key, "name": candidate.name, "role": candidate.role, "session_id": None}
+        session_id_var.set(None)  # the worker's previous candidate
+        started = time.perf_counter()
+        state = None
+        for attempt in range(1, self.max_attempts + 1):
+            await self.gate.wait()
+            try:
+                if state is None:
+                    state = await self._open_session(candidate)
+                    entry["session_id"] = state.session_id
+                await state.prepare(candidate.name)
+                entry["status"] = "ready"
+                break
+            except Exception as e:
+                delay, rate_limited = retry_delay(e, attempt)
+                if delay is None or attempt == self.max_attempts:
+                    logger.error("Could not prepare %s: %s", candidate.name, e)
+                    entry["status"] = "failed"
+                    entry["error"] = str(e)
+                    break
+                if rate_limited:
+                    self.gate.pause(delay)
+                logger.warning("Attempt %d for %s failed (%s); retrying in %.1fs", attempt, candidate.name, e, delay)
+                await asyncio.sleep(delay)
+        entry["attempts"] = attempt
+        entry["seconds"] = round(time.perf_counter() - started, 3)
+        return entry
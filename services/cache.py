@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config.config import TEMP_DIR
+
+
+def content_key(*parts):
+    """Build a stable cache key from the given string parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class TieredCache:
+    """Two-tier cache for JSON-serialisable values.
+
+    Entries live in an in-memory LRU and in one JSON file per key under
+    ``TEMP_DIR/cache/<name>``. The memory tier is bounded by entry count and
+    the disk tier by total bytes; both evict least recently used entries.
+    Worker processes share the directory, so the disk budget is checked
+    against the directory's actual size after every write.
+    With ``ttl`` set, entries older than ``ttl`` seconds are treated as misses.
+    Each entry may carry a small ``meta`` dict used by ``invalidate_matching``.
+    """
+
+    def __init__(self, name, max_memory_entries=256, max_disk_bytes=64 * 1024 * 1024, ttl=None):
+        self.name = name
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.directory = TEMP_DIR / "cache" / name
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _get_memory(self, key):
+        """Memory-tier lookup; must be called with the lock held"""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry["created"]):
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        self.memory_hits += 1
+        return entry
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._get_memory(key)
+            if entry is not None:
+                return entry["value"]
+
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            value = entry["value"]
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if self._expired(entry.get("created", 0)):
+            self.invalidate(key)
+            with self._lock:
+                self.expirations += 1
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mtime doubles as the disk tier's LRU clock
+        except OSError:
+            pass
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return value
+
+    def put(self, key, value, meta=None):
+        """Store value under key in both tiers"""
+        entry = {"created": time.time(), "meta": meta or {}, "value": value}
+        payload = json.dumps(entry)
+        path = self._path(key)
+        # Per process, so workers writing the same key never share a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._remember(key, entry)
+        self._evict_disk()
+
+    def invalidate(self, key):
+        """Drop key from both tiers; returns True if anything was removed"""
+        with self._lock:
+            removed = self._memory.pop(key, None) is not None
+            path = self._path(key)
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                return removed
+            self._disk_bytes -= size
+            return True
+
+    def invalidate_matching(self, **meta):
+        """Drop every entry whose meta contains all the given key/value pairs"""
+        wanted = {k: v for k, v in meta.items() if v is not None}
+        removed = 0
+        for path in list(self.directory.glob("*.json")):
+            try:
+                with open(path, "r") as f:
+                    entry_meta = json.load(f).get("meta", {})
+            except (OSError, ValueError):
+                continue
+            if all(entry_meta.get(k) == v for k, v in wanted.items()):
+                removed += self.invalidate(path.stem)
+        with self._lock:
+            for key in [k for k, e in self._memory.items()
+                        if all(e.get("meta", {}).get(mk) == mv for mk, mv in wanted.items())]:
+                del self._memory[key]
+        return removed
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        return self.invalidate_matching()
+
+    async def aget(self, key):
+        """Async get that only leaves the event loop for the disk tier"""
+        with self._lock:
+            entry = self._get_memory(key)
+            if entry is not None:
+                return entry["value"]
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key, value, meta=None):
+        """Async put; the disk write runs in a worker thread"""
+        await asyncio.to_thread(self.put, key, value, meta)
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_disk(self):
+        """Remove the least recently used files until the directory is under the disk budget"""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # evicted by another worker meanwhile
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        if total > self.max_disk_bytes:
+            for _, size, path in sorted(files, key=lambda file: file[0]):
+                if total <= self.max_disk_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.evictions += evicted
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -1,6 +1,27 @@
 import json
+from functools import lru_cache
+
+from services.prompts import agent_prompt as default_agent_prompt
+from services.template import CompiledTemplate
+
+# Placeholders create_final_prompt fills in
+PROMPT_FIELDS = (
+    "role", "mins", "name", "objective", "questionFocus", "description", "interviewerName",
+    "interviewerPersonality", "candidateName", "questions", "context", "follow_ups",
+    "evaluation_criteria.excellent", "evaluation_criteria.acceptable", "evaluation_criteria.poor",
+    "behavioralQuestions",
+)
+
+
+@lru_cache(maxsize=8)
+def compile_prompt(agent_prompt):
+    """Compile an agent prompt template once; raises ValueError on unknown or missing placeholders"""
+    return CompiledTemplate(agent_prompt, PROMPT_FIELDS)
+
+
+# Compile the shipped prompt at import so placeholder mistakes fail at startup
+compile_prompt(default_agent_prompt)
 
-import json
 
 def create_final_prompt(agent_prompt, role, mins, candidate_name, objective, role_specific_guidelines, role_personality, question_focus, interviewer_details, mandatory_questions, questions, role_perspective):
     """
@@ -24,8 +45,6 @@ def create_final_prompt(agent_prompt, role, mins, candidate_name, objective, rol
         str: The final agent prompt with all placeholders replaced.
     """
 
-    interviewer_name = interviewer_details['name']
-
     # Build the mandatory questions string based on mandatory_questions
     mandatory_questions_list = []
     if mandatory_questions and "required" in mandatory_questions:
@@ -46,6 +65,17 @@ def create_final_prompt(agent_prompt, role, mins, candidate_name, objective, rol
     behavioral_questions = None # Or provide a list of behavioral questions here, e.g. ["Tell me about a time you failed...", "Describe a time you worked in a team..."]
     behavioral_questions_string = "\n".join(behavioral_questions) if behavioral_questions else None
 
+    # Perform variable substitution in a single pass over the compiled template
+    values = role_prompt_values(role, role_personality, question_focus, interviewer_details,
+                                behavioral_questions_string)
+    values.update(candidate_prompt_values(mins, candidate_name, objective, questions))
+    final_prompt = compile_prompt(agent_prompt).render(values)
+
+    return final_prompt
+
+
+def role_prompt_values(role, role_personality, question_focus, interviewer_details, behavioral_questions_string=None):
+    """Placeholder values that depend only on the interviewer role"""
     # Example context, follow_ups, and evaluation criteria
     context = "Evaluate the candidate's approach to problem-solving, code clarity, and efficiency."
     follow_ups = ["Why did you choose this approach?", "What are the trade-offs?", "Can you optimize your solution?"]
@@ -55,25 +85,27 @@ def create_final_prompt(agent_prompt, role, mins, candidate_name, objective, rol
         "poor": "Struggles to understand the problem or provides an inadequate solution."
     }
 
-    # Convert to JSON strings where needed
-    evaluation_criteria_json = json.dumps(evaluation_criteria)
-
-    # Perform variable substitution
-    final_prompt = agent_prompt.replace("{{role}}", role)
-    final_prompt = final_prompt.replace("{{mins}}", str(mins))
-    final_prompt = final_prompt.replace("{{name}}", candidate_name)
-    final_prompt = final_prompt.replace("{{objective}}", objective)
-    final_prompt = final_prompt.replace("{{questionFocus}}", ", ".join(question_focus))
-    final_prompt = final_prompt.replace("{{description}}", interviewer_details['description'])
-    final_prompt = final_prompt.replace("{{interviewerName}}", interviewer_name)
-    final_prompt = final_prompt.replace("{{interviewerPersonality}}", role_personality)
-    final_prompt = final_prompt.replace("{{candidateName}}", candidate_name)
-    final_prompt = final_prompt.replace("{{questions}}", str(questions))
-    final_prompt = final_prompt.replace("{{context}}", context)
-    final_prompt = final_prompt.replace("{{follow_ups}}", ", ".join(follow_ups))
-    final_prompt = final_prompt.replace("{{evaluation_criteria.excellent}}", evaluation_criteria["excellent"])
-    final_prompt = final_prompt.replace("{{evaluation_criteria.acceptable}}", evaluation_criteria["acceptable"])
-    final_prompt = final_prompt.replace("{{evaluation_criteria.poor}}", evaluation_criteria["poor"])
-    final_prompt = final_prompt.replace("{{behavioralQuestions}}", behavioral_questions_string if behavioral_questions_string else "null")
+    return {
+        "role": role,
+        "questionFocus": ", ".join(question_focus),
+        "description": interviewer_details['description'],
+        "interviewerName": interviewer_details['name'],
+        "interviewerPersonality": role_personality,
+        "context": context,
+        "follow_ups": ", ".join(follow_ups),
+        "evaluation_criteria.excellent": evaluation_criteria["excellent"],
+        "evaluation_criteria.acceptable": evaluation_criteria["acceptable"],
+        "evaluation_criteria.poor": evaluation_criteria["poor"],
+        "behavioralQuestions": behavioral_questions_string if behavioral_questions_string else "null",
+    }
 
-    return final_prompt
+
+def candidate_prompt_values(mins, candidate_name, objective, questions):
+    """Placeholder values that change with every candidate"""
+    return {
+        "mins": str(mins),
+        "name": candidate_name,
+        "candidateName": candidate_name,
+        "objective": objective,
+        "questions": str(questions),
+    }
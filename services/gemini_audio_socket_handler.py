@@ -1,51 +1,136 @@
 import time
 import os
 import asyncio
-import traceback
+import logging
 import json
 import websockets
 import base64
+import weakref
 from services.prompts import agent_prompt
-from config.config import client, CONFIG, MODEL
+from services.audio_ingest import AudioIngest
+from services.audio_protocol import PROTOCOL_BINARY, PROTOCOL_JSON, FRAME_AUDIO, pack_audio_frame, unpack_frame
+from services.audio_coalescer import AudioCoalescer
+from services.audio_queue import AudioQueue
+from services.vad import VoiceActivityDetector
+from services.silence_timer import silence_timers
+from services.live_connection import LiveConnection
+from services import metrics
+from config.config import (
+    SEND_SAMPLE_RATE, UPSTREAM_PACKET_MS, UPSTREAM_FLUSH_MS,
+    VAD_ENABLED, VAD_ENERGY_THRESHOLD_DB, VAD_HANGOVER_MS, VAD_PREROLL_MS, SILENCE_TIMEOUT_SECONDS,
+    AUDIO_QUEUE_MAX_BYTES, AUDIO_QUEUE_MAX_LATENCY_MS, AUDIO_QUEUE_POLICY,
+)
+
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_CHUNK_BYTES = metrics.AUDIO_CHUNK_BYTES.labels(direction="upstream")
+DOWNSTREAM_CHUNK_BYTES = metrics.AUDIO_CHUNK_BYTES.labels(direction="downstream")
+
+# Live handlers, plus totals folded in from finished ones, back the session metrics
+_active_handlers = weakref.WeakSet()
+_finished_totals = {"dropped_bytes": 0, "vad_input": 0, "vad_suppressed": 0, "frames_in": 0, "sends_out": 0}
+
+
+def _total(key, live):
+    return _finished_totals[key] + sum(live(handler) for handler in list(_active_handlers))
+
+
+metrics.AUDIO_QUEUE_DEPTH_BYTES.set_function(
+    lambda: sum(handler.out_queue.depth_bytes for handler in list(_active_handlers)))
+metrics.AUDIO_QUEUE_DEPTH_FRAMES.set_function(
+    lambda: sum(handler.out_queue.qsize() for handler in list(_active_handlers)))
+metrics.AUDIO_DROPPED_BYTES.set_function(lambda: _total("dropped_bytes", lambda h: h.out_queue.dropped_bytes))
+metrics.VAD_INPUT_BYTES.set_function(lambda: _total("vad_input", lambda h: h.vad.bytes_in if h.vad else 0))
+metrics.VAD_SUPPRESSED_BYTES.set_function(
+    lambda: _total("vad_suppressed", lambda h: h.vad.bytes_suppressed if h.vad else 0))
+metrics.UPSTREAM_FRAMES.set_function(lambda: _total("frames_in", lambda h: h.coalescer.frames_in))
+metrics.UPSTREAM_SENDS.set_function(lambda: _total("sends_out", lambda h: h.coalescer.sends_out))
 
 
 class GeminiAudioWebSocketHandler:
-    def __init__(self, websocket, initial_prompt=agent_prompt, gain=1.0):
+    def __init__(self, websocket, initial_prompt=agent_prompt, gain=1.0, protocol=PROTOCOL_JSON,
+                 connection=None, accepted_at=None):
         self.websocket = websocket
-        self.audio_in_queue = asyncio.Queue()
-        self.out_queue = asyncio.Queue(maxsize=10000)
+        # An already opened LiveConnection (e.g. connected during preparation), if any
+        self.connection = connection
+        self.protocol = protocol
+        self.send_sequence = 0
+        self.out_queue = AudioQueue(
+            SEND_SAMPLE_RATE,
+            max_bytes=AUDIO_QUEUE_MAX_BYTES,
+            max_latency_ms=AUDIO_QUEUE_MAX_LATENCY_MS,
+            policy=AUDIO_QUEUE_POLICY,
+        )
+        self.coalescer = AudioCoalescer(
+            self.out_queue, SEND_SAMPLE_RATE,
+            target_ms=UPSTREAM_PACKET_MS, flush_ms=UPSTREAM_FLUSH_MS,
+        )
         self.session = None
         self.initial_prompt = initial_prompt
         self.gain = gain
+        self.audio_ingest = AudioIngest(gain)
+        self.vad = VoiceActivityDetector(
+            SEND_SAMPLE_RATE,
+            energy_threshold_db=VAD_ENERGY_THRESHOLD_DB,
+            hangover_ms=VAD_HANGOVER_MS,
+            preroll_ms=VAD_PREROLL_MS,
+        ) if VAD_ENABLED else None
         self.active = True
-        self.last_audio_time = time.time()
+        self.last_audio_time = time.monotonic()
+        # Latency bookkeeping: when initial_prompt went out, when the candidate last spoke in
+        # the turn still in progress, and when the last completed turn Gemini has not
+        # answered yet ended
+        self.prompt_sent_at = None
+        self.last_speech_at = None
+        self.turn_ended_at = None
+        self.accepted_at = accepted_at
         
 
-    async def apply_gain(self, data, gain):
-        """Applies a gain factor to the audio data."""
-        if gain == 1.0:
-            return data
-        
-        import numpy as np
-        # Convert the base64 data to a numpy array of integers
-        audio_bytes = base64.b64decode(data)
-        audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
+    async def ingest_audio(self, pcm):
+        """Queue one chunk of client PCM (already gain-adjusted) for Gemini"""
+        # Silence is dropped locally; only speech (plus hangover and pre-roll) goes upstream
+        chunks = self.vad.process(pcm) if self.vad else [pcm]
+        if self.vad:
+            if self.vad.last_is_speech:
+                self.last_speech_at = time.monotonic()
+                self.turn_ended_at = None  # still the same turn
+            elif self.last_speech_at is not None:
+                self.end_turn()  # speech just turned into silence
+        if not chunks:
+            return
 
-        # Apply the gain, clipping to avoid overflow
-        audio_array = (audio_array * gain).astype(np.int16)
-
-        # Convert back to base64
-        return base64.b64encode(audio_array.tobytes()).decode('utf-8')
+        # Re-arm the end-of-speech deadline. With VAD on this only happens while
+        # the candidate speaks, so the stream is ended once they stop.
+        self.last_audio_time = time.monotonic()
+        silence_timers.arm(self, SILENCE_TIMEOUT_SECONDS, self.on_silence)
+        if not self.vad:
+            # Without VAD a turn is whatever audio came before the silence timeout
+            self.last_speech_at = self.last_audio_time
+            self.turn_ended_at = None
+        speech = self.vad.last_is_speech if self.vad else True
+        
+        # Send to Gemini. Only the last chunk can be speech; any before it are VAD pre-roll,
+        # which the queue may shed first under backpressure.
+        for index, chunk in enumerate(chunks, 1):
+            self.out_queue.put_nowait({
+                "data": chunk, 
+                "mime_type": "audio/pcm",
+                "speech": speech and index == len(chunks),
+            })
 
     async def send_audio_to_gemini(self):
         """Background task to read audio from the websocket and send it to Gemini"""
         try:
             while self.active:
-                msg = await self.out_queue.get()
-                await self.session.send_realtime_input(audio=msg)
+                # Small client chunks are batched so each upstream call carries more audio
+                packet = await self.coalescer.next_packet()
+                UPSTREAM_CHUNK_BYTES.observe(len(packet))
+                await self.session.send_realtime_input(
+                    audio={"data": packet, "mime_type": "audio/pcm"}
+                )
         except Exception as e:
-            print(f"Error in send_audio_to_gemini: {e}")
-            traceback.print_exc()
+            logger.exception("Error in send_audio_to_gemini: %s", e)
 
     async def receive_from_gemini(self):
         """Background task to read from Gemini and forward to the websocket"""
@@ -56,40 +141,55 @@ class GeminiAudioWebSocketHandler:
                     response_data = {}
                     
                     if data := response.data:
+                        self.record_downstream_audio(len(data))
                         # Debug info
-                        print(f"Received audio data from Gemini: {len(data)} bytes")
+                        logger.debug("Received audio data from Gemini: %d bytes", len(data),
+                                     extra={"sample": "gemini_audio_in"})
                         
-                        # Convert binary audio data to base64 for WebSocket transmission
-                        audio_base64 = base64.b64encode(data).decode('utf-8')
-                        response_data['audio'] = audio_base64
+                        if self.protocol == PROTOCOL_BINARY:
+                            await self.websocket.send(pack_audio_frame(self.send_sequence, data))
+                            self.send_sequence += 1
+                        else:
+                            # Convert binary audio data to base64 for WebSocket transmission
+                            audio_base64 = base64.b64encode(data).decode('utf-8')
+                            response_data['audio'] = audio_base64
                     
                     if text := response.text:
                         response_data['text'] = text
-                        print(f"Response text: {text}")
+                        logger.info("Response text: %s", text)
                     
+                    # Control and text messages stay JSON in both protocols
                     if response_data:
                         await self.websocket.send(json.dumps(response_data))
-                        print(f"Sent message to client: {len(response_data.get('audio', ''))} bytes audio, {len(response_data.get('text', ''))} chars text")
+                        logger.debug("Sent message to client: %d bytes audio, %d chars text",
+                                     len(response_data.get('audio', '')), len(response_data.get('text', '')),
+                                     extra={"sample": "client_audio_out"})
 
                 # If you interrupt the model, it sends a turn_complete.
                 # For interruptions to work, we need to notify the client
                 await self.websocket.send(json.dumps({"turn_complete": True}))
-                print("Turn complete signal sent to client")
+                logger.debug("Turn complete signal sent to client")
         except Exception as e:
-            print(f"Error in receive_from_gemini: {e}")
-            traceback.print_exc()
+            logger.exception("Error in receive_from_gemini: %s", e)
 
     async def handle_websocket_messages(self):
         """Process incoming messages from the WebSocket client"""
         try:
             async for message in self.websocket:
                 try:
+                    # Binary frames carry raw PCM with a small header
+                    if isinstance(message, (bytes, bytearray)):
+                        frame_type, _sequence, payload = unpack_frame(message)
+                        if frame_type == FRAME_AUDIO:
+                            await self.ingest_audio(self.audio_ingest.ingest(payload))
+                        continue
+
                     data = json.loads(message)
                     
                     # Handle text messages
                     if "text" in data:
                         text = data["text"]
-                        print(f"Received text: {text}")
+                        logger.info("Received text: %s", text)
                         
                         # Check if this is a command to end the session
                         if text.lower() == "q":
@@ -101,19 +201,8 @@ class GeminiAudioWebSocketHandler:
                     
                     # Handle audio data
                     elif "audio" in data:
-                        audio_data = data["audio"]  # Should be base64 encoded
-                        
-                            # Update the timestamp
-                        self.last_audio_time = time.time()
-                        # Apply gain if needed
-                        if self.gain != 1.0:
-                            audio_data = await self.apply_gain(audio_data, self.gain)
-                        
-                        # Send to Gemini
-                        await self.out_queue.put({
-                            "data": base64.b64decode(audio_data), 
-                            "mime_type": "audio/pcm"
-                        })
+                        # Legacy clients send base64 encoded PCM inside JSON
+                        await self.ingest_audio(self.audio_ingest.ingest_base64(data["audio"]))
                     
                     # Handle client-side commands
                     elif "command" in data:
@@ -122,63 +211,85 @@ class GeminiAudioWebSocketHandler:
                             pass
                 
                 except json.JSONDecodeError:
-                    print("Received non-JSON message")
+                    logger.warning("Received non-JSON message")
                 except Exception as e:
-                    print(f"Error processing message: {e}")
-                    traceback.print_exc()
+                    logger.exception("Error processing message: %s", e)
         
         except websockets.exceptions.ConnectionClosed:
-            print("WebSocket connection closed")
+            logger.info("WebSocket connection closed")
         except Exception as e:
-            print(f"Error in handle_websocket_messages: {e}")
-            traceback.print_exc()
+            logger.exception("Error in handle_websocket_messages: %s", e)
         finally:
             self.active = False
 
-    async def monitor_silence(self):
-        """Monitor for prolonged silence and signal end of speech."""
-        try:
-            while self.active:
-                await asyncio.sleep(0.5)  # Check every 0.5 seconds
-                time_since_last_audio = time.time() - self.last_audio_time
-                if time_since_last_audio > 2.0:  # 2 seconds threshold
-                    print("Detected 2 seconds of silence. Signaling end of speech.")
-                    msg = await self.out_queue.get()
-                    await self.session.send_realtime_input(audio=msg)
-                    await self.session.send_realtime_input(audio_stream_end=True)
-                    self.last_audio_time = time.time()  # Reset to prevent repeated signals
-        except Exception as e:
-            print(f"Error in monitor_silence: {e}")
-            traceback.print_exc()
+    def end_turn(self):
+        """Mark the candidate's turn as finished when they last spoke"""
+        self.turn_ended_at = self.last_speech_at
+        self.last_speech_at = None
+
+    def record_downstream_audio(self, size):
+        """Update latency histograms when Gemini audio is about to reach the client"""
+        DOWNSTREAM_CHUNK_BYTES.observe(size)
+        if self.prompt_sent_at is None and self.turn_ended_at is None:
+            return
+        now = time.monotonic()
+        if self.prompt_sent_at is not None:
+            metrics.FIRST_AUDIO_SECONDS.observe(now - self.prompt_sent_at)
+            self.prompt_sent_at = None
+            if self.accepted_at is not None:
+                metrics.GREETING_SECONDS.observe(now - self.accepted_at)
+        # Audio arriving while the candidate still speaks answers no completed turn
+        if self.turn_ended_at is not None:
+            metrics.TURN_LATENCY_SECONDS.observe(now - self.turn_ended_at)
+            self.turn_ended_at = None
+
+    async def on_silence(self):
+        """Called by the shared timer wheel once no audio has arrived for SILENCE_TIMEOUT_SECONDS"""
+        if self.last_speech_at is not None:
+            self.end_turn()
+        if not self.active or self.session is None:
+            return
+        logger.debug("Detected %s seconds of silence. Signaling end of speech.", SILENCE_TIMEOUT_SECONDS)
+        await self.session.send_realtime_input(audio_stream_end=True)
 
 
 
     async def run(self):
         """Main handler for a WebSocket connection"""
+        metrics.ACTIVE_SESSIONS.inc()
+        _active_handlers.add(self)
+        if self.connection is None or self.connection.session is None:
+            self.connection = LiveConnection()
         try:
-            async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
-                self.session = session
-                
-                # Send initial prompt if provided
-                if self.initial_prompt:
-                    print("Sending initial prompt to Gemini...")
-                    await self.session.send(input=self.initial_prompt, end_of_turn=True)
-                    print("Initial prompt sent.")
-                    
-                # Notify client that we're ready
-                await self.websocket.send(json.dumps({"status": "ready"}))
+            if self.connection.session is None:
+                await self.connection.open()
+            else:
+                logger.info("Using Live session opened %.0f ms ago",
+                            (time.monotonic() - self.connection.opened_at) * 1000)
+            self.session = self.connection.session
+            
+            # Send initial prompt if provided
+            if self.initial_prompt:
+                logger.info("Sending initial prompt to Gemini...")
+                await self.session.send(input=self.initial_prompt, end_of_turn=True)
+                self.prompt_sent_at = time.monotonic()
+                logger.info("Initial prompt sent.")
                 
-                # Create tasks for handling audio streams
-                async with asyncio.TaskGroup() as tg:
-                    tg.create_task(self.send_audio_to_gemini())
-                    tg.create_task(self.receive_from_gemini())
-                    tg.create_task(self.handle_websocket_messages())
-                    tg.create_task(self.monitor_silence())
+            # Notify client that we're ready
+            await self.websocket.send(json.dumps({"status": "ready", "protocol": self.protocol}))
+            
+            # Create tasks for handling audio streams
+            async with asyncio.TaskGroup() as tg:
+                upstream = tg.create_task(self.send_audio_to_gemini())
+                downstream = tg.create_task(self.receive_from_gemini())
+                await self.handle_websocket_messages()
+                # The client left or ended the session; stop streaming in both directions
+                upstream.cancel()
+                downstream.cancel()
         except asyncio.CancelledError:
-            print("Session cancelled")
+            logger.info("Session cancelled")
         except Exception as e:
-            print(f"Error in WebSocket handler: {e}")
-            traceback.print_exc()
+            logger.exception("Error in WebSocket handler: %s", e)
             error_msg = {"error": str(e)}
             try:
                 await self.websocket.send(json.dumps(error_msg))
@@ -186,5 +297,19 @@ class GeminiAudioWebSocketHandler:
                 pass
         finally:
             self.active = False
-            print("WebSocket handler finished")
+            silence_timers.cancel(self)
+            metrics.ACTIVE_SESSIONS.dec()
+            _active_handlers.discard(self)
+            _finished_totals["dropped_bytes"] += self.out_queue.dropped_bytes
+            _finished_totals["frames_in"] += self.coalescer.frames_in
+            _finished_totals["sends_out"] += self.coalescer.sends_out
+            if self.vad:
+                _finished_totals["vad_input"] += self.vad.bytes_in
+                _finished_totals["vad_suppressed"] += self.vad.bytes_suppressed
+            logger.info("WebSocket handler finished", extra={
+                "packetization": self.coalescer.stats(),
+                "audio_queue": self.out_queue.stats(),
+                "vad": self.vad.stats() if self.vad else None,
+            })
+            await self.connection.close()
 
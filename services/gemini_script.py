@@ -1,8 +1,80 @@
 import os
+import re
+import inspect
 import json
-from openai import OpenAI
+import asyncio
+import logging
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from openai import AsyncOpenAI
 from pdfminer.high_level import extract_text
 from typing import Dict, List, Optional
+from config.config import (
+    PDF_POOL_WORKERS, ANALYSIS_CACHE_MEMORY_ENTRIES, ANALYSIS_CACHE_DISK_MB,
+    QUESTION_CACHE_TTL_SECONDS, OPENAI_BASE_URL,
+    TEXT_CACHE_MEMORY_ENTRIES, TEXT_CACHE_DISK_MB,
+)
+from services.cache import TieredCache, content_key
+from services.question_store import QuestionStore
+from services.session_store import session_store
+from services.metrics import CACHE_LOOKUPS
+from services.skill_index import skill_index
+from services.jd_parser import parse_jd
+
+logger = logging.getLogger(__name__)
+
+# PDF parsing is pure-Python CPU work; it runs in a small process pool so it
+# never holds the GIL of the process that serves live audio sessions.
+_pdf_pool = None
+
+
+def get_pdf_pool():
+    """Return the shared, lazily created process pool used for PDF parsing"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+# Resume analyses keyed by hash(analysis prompt version, resume text)
+analysis_cache = TieredCache(
+    "analysis",
+    max_memory_entries=ANALYSIS_CACHE_MEMORY_ENTRIES,
+    max_disk_bytes=ANALYSIS_CACHE_DISK_MB * 1024 * 1024,
+)
+
+# Text extracted from uploaded PDFs keyed by the upload's SHA-256
+text_cache = TieredCache(
+    "parsed_text",
+    max_memory_entries=TEXT_CACHE_MEMORY_ENTRIES,
+    max_disk_bytes=TEXT_CACHE_DISK_MB * 1024 * 1024,
+)
+
+# Generated question sets keyed by (resume, JD, role, difficulty, prompt version), shared by all workers
+question_store = QuestionStore(session_store, ttl=QUESTION_CACHE_TTL_SECONDS)
+
+
+def _cache_lookups():
+    lookups = {}
+    for name, stats in (("analysis", analysis_cache.stats()), ("parsed_text", text_cache.stats())):
+        for result in ("memory_hits", "disk_hits", "misses"):
+            lookups[(name, result)] = stats[result]
+    lookups[("questions", "store_hits")] = question_store.hits
+    lookups[("questions", "misses")] = question_store.misses
+    return lookups
+
+
+CACHE_LOOKUPS.set_function(_cache_lookups)
+
+# Terms that mark a requirement word or word pair as a skill in analyze_skill_gaps
+GENERIC_REQUIREMENT_WORDS = frozenset(['experience', 'knowledge', 'skills', 'proficiency'])
+TECH_TERMS = re.compile("python|java|react|node|sql|aws|azure|docker|kubernetes")
+SKILL_PHRASES = re.compile("machine learning|data analysis|system design|team management")
+
 
 class InterviewQuestionGenerator:
     def __init__(self):
@@ -322,80 +394,29 @@ class InterviewQuestionGenerator:
                     domain_experience += ", "
                 domain_experience += f"{job.get('role')} at {job.get('company')}"
         
-        # Extract all skills mentioned in the job description
-        jd_skills = self._extract_skills_from_jd(job_description)
+        # Index of the skills mentioned in the job description, built once per JD
+        jd_skills = parse_jd(job_description).skill_index
         
         # Find strong matches (skills mentioned in both resume and JD)
-        strong_matches = []
         all_candidate_skills = technical_skills + functional_skills + leadership_skills
-        
-        for skill in all_candidate_skills:
-            if any(jd_skill.lower() in skill.lower() or skill.lower() in jd_skill.lower() 
-                   for jd_skill in jd_skills):
-                strong_matches.append(skill)
+        strong_matches = [skill for skill in all_candidate_skills if jd_skills.overlaps(skill)]
         
         return {
             'strongMatches': strong_matches,
             'domainExperience': domain_experience
         }
     
-    def _extract_skills_from_jd(self, job_description):
+    @staticmethod
+    def _extract_skills_from_jd(job_description):
         """Extract skills from job description using basic NLP techniques"""
-        # In a production environment, you would use NLP techniques
-        # For simplicity, we'll use a basic approach here
-        skills = []
-        
-        # Split by common separators and extract potential skills
-        lines = job_description.split('\n')
-        for line in lines:
-            if ":" in line or "•" in line or "-" in line:
-                # Extract potential skill after separators
-                skills.append(line.split(":")[-1].strip())
-                skills.append(line.split("•")[-1].strip())
-                skills.append(line.split("-")[-1].strip())
-        
-        # Filter out empty strings and duplicates
-        skills = [s for s in skills if s]
-        return list(set(skills))
+        # Fragments after the last ':', '•' or '-' of each line, from the memoized JD parse
+        return list(parse_jd(job_description).skills)
     
     def extract_job_requirements(self, job_description):
         """Extract job requirements from job description"""
-        requirements = []
-        
-        # Split by newlines and look for requirements sections
-        lines = job_description.split('\n')
-        in_requirements_section = False
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Check if we're in a requirements section
-            if any(header in line.lower() for header in ['requirements', 'qualifications', 'skills']):
-                in_requirements_section = True
-                continue
-                
-            if in_requirements_section and line:
-                # If line starts with common bullet points, add as requirement
-                if line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                    requirements.append(line[1:].strip())
-                # If line starts with a number, add as requirement
-                elif line[0].isdigit() and len(line) > 1 and line[1] in ['.', ')']:
-                    requirements.append(line[2:].strip())
-                # If line is short and has keywords, add as requirement
-                elif len(line) < 100 and any(kw in line.lower() for kw in ['experience', 'knowledge', 'ability']):
-                    requirements.append(line)
-            
-            # Check if we've left the requirements section
-            if in_requirements_section and not line:
-                in_requirements_section = False
-        
-        # If we couldn't find any requirements, extract key phrases
-        if not requirements:
-            for line in lines:
-                if any(kw in line.lower() for kw in ['experience', 'knowledge', 'ability', 'proficient']):
-                    requirements.append(line.strip())
-        
-        return requirements
+        # Bullet, numbered and keyword lines of the requirements sections, falling back to
+        # every keyword line; parsed once per JD
+        return list(parse_jd(job_description).requirements)
     
     def analyze_skill_gaps(self, analysis, requirements):
         """Analyze skill gaps between job requirements and candidate skills"""
@@ -408,36 +429,21 @@ class InterviewQuestionGenerator:
         
         all_skills.extend(analysis.get('unverified_skills', []))
         
-        # Convert skills to lowercase for comparison
-        candidate_skills = [skill.lower() for skill in all_skills]
-        
-        # Extract skills from requirements
-        required_skills = []
+        # Index the candidate's skills (lower-cased) once per resume
+        candidate_skills = skill_index(tuple(skill.lower() for skill in all_skills))
         
-        for req in requirements:
-            # Extract potential skills from requirement
-            words = req.split()
-            for i in range(len(words)):
-                # Check single words that might be skills
-                if words[i].lower() in ['experience', 'knowledge', 'skills', 'proficiency']:
-                    continue
-                
-                # Check for technical terms and tools
-                if any(tech in words[i].lower() for tech in ['python', 'java', 'react', 'node', 'sql', 'aws', 'azure', 'docker', 'kubernetes']):
-                    required_skills.append(words[i])
-                
-                # Check for phrases that might be skills
-                if i < len(words) - 1:
-                    phrase = f"{words[i]} {words[i+1]}"
-                    if any(term in phrase.lower() for term in ['machine learning', 'data analysis', 'system design', 'team management']):
-                        required_skills.append(phrase)
+        # Extract skills from requirements (the same for every candidate of a JD)
+        required_skills = required_skills_of(tuple(requirements))
         
-        # Find gaps (skills required but not present in candidate profile)
+        # Find gaps (skills required but not present in candidate profile);
+        # requirements repeat the same terms, so each distinct one is looked up once
+        present = {}
         skill_gaps = []
         
         for skill in required_skills:
-            skill_lower = skill.lower()
-            if not any(candidate_skill in skill_lower or skill_lower in candidate_skill for candidate_skill in candidate_skills):
+            if skill not in present:
+                present[skill] = candidate_skills.overlaps(skill)
+            if not present[skill]:
                 skill_gaps.append(skill)
         
         return skill_gaps
@@ -714,9 +720,55 @@ TASK: Create {question_count} interview questions following all guidelines above
         
         return prompt
 
+@lru_cache(maxsize=32)
+def required_skills_of(requirements):
+    """Words and word pairs of a tuple of requirements that name a technology or skill"""
+    required_skills = []
+    for req in requirements:
+        # Extract potential skills from requirement
+        words = req.split()
+        lowered = [word.lower() for word in words]
+        for i in range(len(words)):
+            # Check single words that might be skills
+            if lowered[i] in GENERIC_REQUIREMENT_WORDS:
+                continue
+            
+            # Check for technical terms and tools
+            if TECH_TERMS.search(lowered[i]):
+                required_skills.append(words[i])
+            
+            # Check for phrases that might be skills
+            if i < len(words) - 1 and SKILL_PHRASES.search(f"{lowered[i]} {lowered[i+1]}"):
+                required_skills.append(f"{words[i]} {words[i+1]}")
+    return tuple(required_skills)
+
+
+@lru_cache(maxsize=1)
+def question_prompt_source():
+    """Source of everything a question prompt is built from.
+
+    That is InterviewQuestionGenerator (create_question_prompt, its helpers
+    and the role tables), the JD parser and the skill terms, so any edit to
+    them changes question_prompt_version without a manual bump.
+    """
+    return "\0".join([
+        inspect.getsource(InterviewQuestionGenerator),
+        inspect.getsource(inspect.getmodule(parse_jd)),
+        " ".join(sorted(GENERIC_REQUIREMENT_WORDS)),
+        TECH_TERMS.pattern,
+        SKILL_PHRASES.pattern,
+    ])
+
+
 class ResumeAnalyzer:
-    def __init__(self, openai_api_key: str):
-        self.client = OpenAI(api_key=openai_api_key)
+    ANALYSIS_MODEL = "gpt-4o-mini"
+
+    def __init__(self, openai_api_key: str, cache: Optional[TieredCache] = None,
+                 questions: Optional[QuestionStore] = None, texts: Optional[TieredCache] = None):
+        self.client = AsyncOpenAI(api_key=openai_api_key, base_url=OPENAI_BASE_URL)
+        self.cache = cache if cache is not None else analysis_cache
+        self.questions = questions if questions is not None else question_store
+        self.texts = texts if texts is not None else text_cache
         self.system_prompt = """You are an advanced AI interviewer that adapts its approach based on:
 1. Candidate Experience Level Analysis
 2. Role-Specific Personality
@@ -942,15 +994,44 @@ Analysis Rules:
     - Consider geographic context for employment patterns and role expectations
     - Compare experience to typical industry benchmarks rather than absolute standards"""  # Include full original analysis prompt
 
+        # Cache keys include a digest of everything that shapes the model output,
+        # so editing a prompt or switching models never serves stale results
+        self.analysis_prompt_version = content_key(
+            self.ANALYSIS_MODEL, self.system_prompt, self.universal_analysis_prompt
+        )[:16]
+        self.question_prompt_version = content_key(
+            self.ANALYSIS_MODEL, self.system_prompt, question_prompt_source()
+        )[:16]
+
     def parse_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
         return extract_text(file_path)
 
-    def analyze_resume(self, resume_text: str) -> Dict:
+    async def parse_pdf_async(self, file_path: str) -> str:
+        """Extract text from PDF file in the PDF process pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_pdf_pool(), extract_text, file_path)
+
+    async def extract_text(self, file_path: str, file_hash: Optional[str] = None) -> str:
+        """Text of a PDF, served from the parsed-text cache when its upload hash is known"""
+        if file_hash is None:
+            return await self.parse_pdf_async(file_path)
+        text = await self.texts.aget(file_hash)
+        if text is None:
+            text = await self.parse_pdf_async(file_path)
+            await self.texts.aput(file_hash, text)
+        return text
+
+    async def analyze_resume(self, resume_text: str) -> Dict:
         """Analyze resume using OpenAI and return analysis JSON"""
+        cache_key = content_key(self.analysis_prompt_version, resume_text)
+        cached = await self.cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await self.client.chat.completions.create(
+                model=self.ANALYSIS_MODEL,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": self.universal_analysis_prompt.format(resume_text=resume_text)}
@@ -958,36 +1039,63 @@ Analysis Rules:
                 response_format={"type": "json_object"}
             )
             raw_content = response.choices[0].message.content
-            print("Raw API Response:", raw_content)  # Log the raw response for debugging
-            return json.loads(raw_content)
+            logger.debug("Raw API Response: %s", raw_content)  # Log the raw response for debugging
+            analysis = json.loads(raw_content)
         except json.JSONDecodeError as e:
-            print(f"JSON Decode Error: {e}")
-            print(f"Problematic content: {raw_content}")
+            logger.error("JSON Decode Error: %s", e)
+            logger.debug("Problematic content: %s", raw_content)
             raise Exception(f"JSON parsing failed: {str(e)}")
         except Exception as e:
             raise Exception(f"Analysis failed: {str(e)}")
 
-    def generate_questions(self, analysis: Dict, job_description: str, 
-                          interviewer_role: str, difficulty: str = 'medium') -> Dict:
-        """Generate interview questions based on analysis and job description"""
+        await self.cache.aput(cache_key, analysis)
+        return analysis
+
+    def question_fields(self, analysis: Dict, job_description: str, interviewer_role: str,
+                        difficulty: str, resume_hash: Optional[str] = None) -> tuple:
+        """The question store fields a question set for these inputs is kept under"""
+        if resume_hash is None:
+            resume_hash = content_key(json.dumps(analysis, sort_keys=True))
+        return (resume_hash, content_key(job_description), interviewer_role,
+                difficulty, self.question_prompt_version)
+
+    async def generate_questions(self, analysis: Dict, job_description: str, 
+                          interviewer_role: str, difficulty: str = 'medium',
+                          resume_hash: Optional[str] = None) -> Dict:
+        """Generate interview questions based on analysis and job description
+
+        Question sets are memoized in the question store; pass resume_hash (a
+        hash of the resume text) to key on the resume rather than the analysis.
+        """
+        store_key = self.question_fields(analysis, job_description, interviewer_role, difficulty, resume_hash)
+        stored = await self.questions.get(*store_key)
+        if stored is not None:
+            return stored
+
         question_count = {
             'hard': 15,
             'medium': 10,
             'easy': 5
         }.get(difficulty, 10)
 
-        prompt = InterviewQuestionGenerator().create_question_prompt(analysis, job_description, interviewer_role, question_count)
+        # Prompt construction scans the whole JD; keep it off the event loop
+        prompt = await asyncio.to_thread(
+            InterviewQuestionGenerator().create_question_prompt,
+            analysis, job_description, interviewer_role, question_count
+        )
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await self.client.chat.completions.create(
+                model=self.ANALYSIS_MODEL,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": prompt}
                 ],
                 response_format={"type": "json_object"}
             )
-            return json.loads(response.choices[0].message.content)
+            questions = json.loads(response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"Question generation failed: {str(e)}")
 
+        await self.questions.put(questions, *store_key)
+        return questions
@@ -1,78 +1,290 @@
 import time
 import os
 import asyncio
-import traceback
+import logging
 import json
 import websockets
 import base64
-from services.final_prompt import create_final_prompt
+import re
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from services.role_prompts import RolePromptCache
 from services.gemini_script import InterviewQuestionGenerator, ResumeAnalyzer
-from services.prompts import agent_prompt
-from config.config import TEMP_DIR, client, CONFIG, MODEL
+from services.cache import content_key
+from services.metrics import PREPARE_STAGE_SECONDS
+from services.session_store import session_store
+from config.config import TEMP_DIR, client, CONFIG, MODEL, SESSION_TTL_SECONDS, SESSION_MEMORY_BUDGET_MB
+
+# Stateless helpers shared by every session
+analyzer = ResumeAnalyzer(os.environ.get("OPENAI_API_KEY"))
+qa_generator = InterviewQuestionGenerator()
+role_prompts = RolePromptCache(qa_generator, session_store)
+
+PROMPT_DIR = TEMP_DIR / "prompts"
+SESSION_ID = re.compile(r"[0-9a-f]{32}")
+DIGEST = re.compile(r"[0-9a-f]{64}")
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ROLE = "SD1"
 
 
 class InterviewState:
-    def __init__(self):
+    def __init__(self, session_id, ttl=SESSION_TTL_SECONDS):
+        self.session_id = session_id
+        # How long the session's record and artifacts stay in the store unused
+        self.ttl = ttl
         self.resume_path = None
         self.jd_path = None
+        # SHA-256 of the uploaded files; uploads with the same content share one file
+        self.resume_hash = None
+        self.jd_hash = None
         self.final_prompt = None
         self.candidate_name = None
-        self.analyzer = ResumeAnalyzer(os.environ.get("OPENAI_API_KEY"))
-        self.qa_generator = InterviewQuestionGenerator()
+        self.role = DEFAULT_ROLE
+        self.stage_timings = {}
+        self.analyzer = analyzer
+        self.qa_generator = qa_generator
+        self.store = session_store
+        self.last_used = time.monotonic()
+        self.connections = 0
+
+    @property
+    def prompt_path(self):
+        return PROMPT_DIR / f"{self.session_id}.txt"
+
+    def approx_size(self):
+        """Rough number of bytes this session keeps alive"""
+        return 512 + len(self.final_prompt or "") + len(self.candidate_name or "")
+
+    def record(self):
+        """The part of the session shared through the store"""
+        return {
+            "resume_path": str(self.resume_path) if self.resume_path else None,
+            "jd_path": str(self.jd_path) if self.jd_path else None,
+            "resume_hash": self.resume_hash,
+            "jd_hash": self.jd_hash,
+            "role": self.role,
+        }
+
+    def apply_record(self, record):
+        self.resume_path = Path(record["resume_path"]) if record.get("resume_path") else None
+        self.jd_path = Path(record["jd_path"]) if record.get("jd_path") else None
+        self.resume_hash = record.get("resume_hash")
+        self.jd_hash = record.get("jd_hash")
+        self.role = record.get("role", DEFAULT_ROLE)
+
+    async def document_text(self, kind):
+        """Text of the uploaded resume or JD, parsed once per content hash (see text_cache)"""
+        file_hash = getattr(self, f"{kind}_hash")
+        return await self.analyzer.extract_text(str(getattr(self, f"{kind}_path")), file_hash)
 
     async def prepare_interview(self, candidate_name):
         """Prepare the interview by analyzing resume and JD"""
         try:
-            self.candidate_name = candidate_name
-            # Parse and analyze documents
-            resume_text = self.analyzer.parse_pdf(str(self.resume_path))
-            jd_text = self.analyzer.parse_pdf(str(self.jd_path))
-            analysis = self.analyzer.analyze_resume(resume_text)
-            
-            questions = self.analyzer.generate_questions(
+            await self.prepare(candidate_name)
+            return True
+        except Exception as e:
+            logger.exception("Error preparing interview: %s", e)
+            return False
+
+    async def prepare(self, candidate_name):
+        """Build the final prompt for the session's documents and role; raises on failure"""
+        self.candidate_name = candidate_name
+        self.stage_timings = {}
+        started = time.perf_counter()
+        role, difficulty = self.role, "hard"
+        await role_prompts.sync()
+
+        # A prompt already prepared for these documents and this candidate, on any
+        # worker, is used as is while the question set it was rendered from is stored
+        prompt_key = content_key(self.resume_hash, self.jd_hash, candidate_name, role, difficulty,
+                                 role_prompts.version, self.analyzer.question_prompt_version)
+        prepared = await self._timed("load_prompt", self._load_prompt(prompt_key))
+        if prepared is not None:
+            self.final_prompt = prepared
+        else:
+            # Text is normally parsed at upload; the parse stages only do work for
+            # documents the parsed-text cache has not seen
+            resume_text, jd_text = await asyncio.gather(
+                self._timed("parse_resume", self.document_text("resume")),
+                self._timed("parse_jd", self.document_text("jd")),
+            )
+            analysis = await self._timed("analyze_resume", self.analyzer.analyze_resume(resume_text))
+
+            # Question sets are shared through the question store, which also invalidates them
+            questions = await self._timed("generate_questions", self.analyzer.generate_questions(
                 analysis=analysis,
                 job_description=jd_text,
-                interviewer_role="SD1",
-                difficulty="hard"
-            )
+                interviewer_role=role,
+                difficulty=difficulty,
+                resume_hash=self.resume_hash,
+            ))
+            questions_key = self.analyzer.questions.key(*self.analyzer.question_fields(
+                analysis, jd_text, role, difficulty, self.resume_hash
+            ))
 
-            # Get role specific information
-            role = "SD1"
-            role_specific_guidelines = self.qa_generator.role_specific_guidelines[role]
-            role_personality = self.qa_generator.role_personalities[role]
-            question_focus = self.qa_generator.question_focus[role]
-            interviewer_details = self.qa_generator.interviewer_details[role]
-            mandatory_questions = self.qa_generator.mandatory_questions[role]
-            role_perspective = self.qa_generator.define_role_perspective(role)
-
-            # Create final prompt with candidate name
-            self.final_prompt = create_final_prompt(
-                agent_prompt,
+            stage_started = time.perf_counter()
+            # Role material is pre-rendered at startup; only the candidate fields are spliced in
+            self.final_prompt = role_prompts.render(
                 role,
                 15,  # minutes
                 self.candidate_name,  # Using provided name
                 "Interview for Software Development Engineer 1 position",
-                role_specific_guidelines,
-                role_personality,
-                question_focus,
-                interviewer_details,
-                mandatory_questions,
                 questions,
-                role_perspective
             )
-            #write final prompt to file
-            with open(TEMP_DIR / "final_prompt.txt", "w") as f:
-                f.write(self.final_prompt)
-            return True
-        
-            
-        
-        except Exception as e:
-            print(f"Error preparing interview: {e}")
-            traceback.print_exc()
-            return False
-        
-# Global interview state
-interview_state = InterviewState()
+            self.stage_timings["render_prompt"] = time.perf_counter() - stage_started
+            await self._timed("store_prompt", self.store.aset(
+                f"prompt:{self.session_id}",
+                {"key": prompt_key, "questions": questions_key, "prompt": self.final_prompt},
+                self.ttl,
+            ))
+
+        #write final prompt to file
+        await self._timed("write_prompt", asyncio.to_thread(
+            self.prompt_path.write_text, self.final_prompt
+        ))
+        self.stage_timings["total"] = time.perf_counter() - started
+        for stage, seconds in self.stage_timings.items():
+            PREPARE_STAGE_SECONDS.labels(stage=stage).observe(seconds)
+        logger.info("Interview prepared", extra={
+            "stage_ms": {stage: round(seconds * 1000) for stage, seconds in self.stage_timings.items()}
+        })
+
+    async def _load_prompt(self, prompt_key):
+        """The stored prompt for prompt_key, or None if absent or its question set was dropped"""
+        prepared = await self.store.aget(f"prompt:{self.session_id}", self.ttl)
+        if prepared is None or prepared["key"] != prompt_key:
+            return None
+        if await self.store.aget(prepared["questions"]) is None:
+            return None  # invalidated or expired
+        return prepared["prompt"]
+
+    async def _timed(self, stage, awaitable):
+        """Await a preparation stage and record its wall-clock duration"""
+        stage_started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stage_timings[stage] = time.perf_counter() - stage_started
+
+
+class SessionRegistry:
+    """Per-session interview state, addressed by the session ID returned from the uploads.
+
+    The uploads' hashes are kept as a session record in the shared store, so
+    the uploads and the websocket may each land on a different worker. Every
+    lookup reads the record and restarts its ``ttl``; the store expires
+    records nobody has used for that long.
+
+    Locally, sessions idle for longer than ``ttl`` seconds are dropped from
+    memory, and when the sessions together exceed ``memory_budget`` bytes the
+    least recently used ones are dropped as well. Sessions with a live
+    websocket connection are never dropped. Uploads and prompt files that no
+    live record refers to any more are deleted by a periodic sweep.
+    """
+
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, ttl, memory_budget, store):
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self.store = store
+        self._sessions = OrderedDict()
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+
+    @staticmethod
+    def _key(session_id):
+        return f"session:{session_id}"
+
+    async def create(self):
+        await self._maybe_sweep()
+        self.evict()
+        session_id = uuid.uuid4().hex
+        state = InterviewState(session_id, self.ttl)
+        self._sessions[session_id] = state
+        return state
+
+    async def get(self, session_id):
+        """Return the session and mark it as recently used, or None if unknown"""
+        if not SESSION_ID.fullmatch(session_id or ""):
+            return None
+        await self._maybe_sweep()
+        # Another worker may have taken an upload for this session since we last saw it
+        record = await self.store.aget(self._key(session_id), self.ttl)
+        state = self._sessions.get(session_id)
+        if state is None:
+            if record is None:
+                return None
+            self.evict()
+            state = InterviewState(session_id, self.ttl)
+            self._sessions[session_id] = state
+        if record is not None:
+            state.apply_record(record)
+        state.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return state
+
+    async def save(self, state):
+        """Publish the session's record to every worker"""
+        await self.store.aset(self._key(state.session_id), state.record(), self.ttl)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def evict(self):
+        """Drop idle sessions past the TTL, then LRU sessions over the memory budget"""
+        now = time.monotonic()
+        for session_id, state in list(self._sessions.items()):
+            if state.connections == 0 and now - state.last_used > self.ttl:
+                del self._sessions[session_id]  # its record expires in the store
+                self.evictions += 1
+
+        total = sum(state.approx_size() for state in self._sessions.values())
+        for session_id, state in list(self._sessions.items()):  # least recently used first
+            if total <= self.memory_budget:
+                break
+            if state.connections == 0:
+                total -= state.approx_size()
+                del self._sessions[session_id]
+                self.evictions += 1
+
+    async def _maybe_sweep(self):
+        now = time.monotonic()
+        if now - self._last_sweep > self.SWEEP_INTERVAL:
+            self._last_sweep = now
+            await asyncio.to_thread(self._sweep, set(self._sessions))
+
+    def _sweep(self, local_sessions):
+        """Delete local files of sessions whose records have expired"""
+        self.store.purge_expired()
+        live = set(local_sessions)
+        hashes = set()
+        for key in self.store.keys("session:"):
+            record = self.store.get(key)
+            if record is not None:
+                live.add(key.split(":", 1)[1])
+                hashes.update(value for value in (record.get("resume_hash"), record.get("jd_hash")) if value)
+
+        cutoff = time.time() - self.ttl
+        # Uploads are named by content hash and may be shared by several sessions
+        candidates = [path for kind in ("resume", "jd") for path in (TEMP_DIR / kind).glob("*.pdf")
+                      if DIGEST.fullmatch(path.stem) and path.stem not in hashes]
+        candidates += [path for path in PROMPT_DIR.glob("*.txt") if path.stem not in live]
+        for path in candidates:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
 
 
+# Interview sessions for this process
+session_registry = SessionRegistry(
+    ttl=SESSION_TTL_SECONDS,
+    memory_budget=SESSION_MEMORY_BUDGET_MB * 1024 * 1024,
+    store=session_store,
+)
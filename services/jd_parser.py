@@ -0,0 +1,80 @@
+import re
+from functools import lru_cache
+
+from services.skill_index import SkillIndex
+
+# Matched against lower-cased lines
+SECTION_HEADER = re.compile("requirements|qualifications|skills")
+REQUIREMENT_KEYWORDS = re.compile("experience|knowledge|ability")
+KEYWORDS = re.compile("experience|knowledge|ability|proficient")
+# Any of the above; most lines match none, so one search rules them out
+TERMS = re.compile("requirements|qualifications|skills|experience|knowledge|ability|proficient")
+
+BULLETS = ("-", "•", "*")
+
+
+class ParsedJD:
+    """Structured view of a job description, produced by one pass over its lines.
+
+    ``sections`` are (header, lines) pairs for each requirements-like header
+    and the non-blank lines under it. ``requirements`` are the bullet, numbered
+    and keyword lines of those sections, or every keyword line when the JD has
+    no such section; ``keywords`` holds the keyword lines either way.
+    ``skills`` are the distinct fragments after the last ':', '•' or '-' of
+    each line, and ``skill_index`` indexes them for skill matching.
+    """
+
+    def __init__(self, sections, requirements, skills, keywords):
+        self.sections = sections
+        self.requirements = requirements
+        self.skills = skills
+        self.keywords = keywords
+        self.skill_index = SkillIndex(skills)
+
+
+@lru_cache(maxsize=32)
+def parse_jd(job_description):
+    """Parse a job description once; one JD serves every candidate interviewed for it.
+
+    Memoized on the JD's content, so callers must not modify the returned lists.
+    """
+    sections = []
+    section_lines = None
+    requirements = []
+    skills = []
+    keywords = []
+
+    for raw_line in job_description.split('\n'):
+        # Skill fragments come from the unstripped line, as in the original extraction
+        if ":" in raw_line or "•" in raw_line or "-" in raw_line:
+            skills.append(raw_line.rpartition(":")[2].strip())
+            skills.append(raw_line.rpartition("•")[2].strip())
+            skills.append(raw_line.rpartition("-")[2].strip())
+
+        line = raw_line.strip()
+        lowered = line.lower()
+        has_terms = TERMS.search(lowered) is not None
+        if has_terms and KEYWORDS.search(lowered):
+            keywords.append(line)
+
+        if has_terms and SECTION_HEADER.search(lowered):
+            section_lines = []
+            sections.append((line, section_lines))
+            continue
+
+        if section_lines is None:
+            continue
+        if not line:
+            section_lines = None  # a blank line ends the section
+            continue
+
+        section_lines.append(line)
+        if line.startswith(BULLETS):
+            requirements.append(line[1:].strip())
+        elif line[0].isdigit() and len(line) > 1 and line[1] in ['.', ')']:
+            requirements.append(line[2:].strip())
+        elif has_terms and len(line) < 100 and REQUIREMENT_KEYWORDS.search(lowered):
+            requirements.append(line)
+
+    skills = list(set(skill for skill in skills if skill))
+    return ParsedJD(sections, requirements or keywords, skills, keywords)
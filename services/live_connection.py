@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import AsyncExitStack
+
+from google.genai.live import AsyncSession
+from websockets.asyncio.client import connect as ws_connect
+
+from services import metrics
+from config.config import client, CONFIG, MODEL, GEMINI_LIVE_URL
+
+logger = logging.getLogger(__name__)
+
+
+def sdk_api_client():
+    """The SDK's API client, which an AsyncSession needs to encode and parse messages.
+
+    google-genai has no public accessor for it. This is the only place the
+    private attribute is read, so an SDK upgrade that moves it fails here,
+    by name, rather than inside a session.
+    """
+    api_client = getattr(client, "_api_client", None)
+    if api_client is None:
+        raise RuntimeError("google-genai Client has no _api_client; update sdk_api_client()")
+    return api_client
+
+
+class LiveConnection:
+    """A Gemini Live session that can be opened ahead of the handler that uses it.
+
+    ``client.aio.live.connect`` is an async context manager; entering it on an
+    exit stack lets one task open the session and another use and close it.
+    """
+
+    def __init__(self, model=MODEL, config=CONFIG):
+        self.model = model
+        self.config = config
+        self.session = None
+        self.opened_at = None
+        self._stack = AsyncExitStack()
+
+    async def open(self):
+        """Connect once; raises whatever the connect raised"""
+        started = time.monotonic()
+        if GEMINI_LIVE_URL:
+            self.session = await self._open_local(GEMINI_LIVE_URL)
+        else:
+            self.session = await self._stack.enter_async_context(
+                client.aio.live.connect(model=self.model, config=self.config)
+            )
+        self.opened_at = time.monotonic()
+        metrics.LIVE_CONNECT_SECONDS.observe(self.opened_at - started)
+        return self.session
+
+    async def _open_local(self, url):
+        """Connect to a stand-in Live server over plain ws://.
+
+        The SDK always upgrades to wss:// when an API key is set, so the
+        handshake is done here; the session object is still the SDK's, so
+        every message after setup is encoded and parsed by the real client.
+        """
+        # The socket joins the connection's stack only once setup succeeded; a
+        # failed setup closes it on the way out
+        async with AsyncExitStack() as stack:
+            websocket = await stack.enter_async_context(ws_connect(url, max_size=None))
+            await websocket.send(json.dumps({"setup": {"model": self.model}}))
+            setup = json.loads(await websocket.recv())
+            if "setupComplete" not in setup:
+                raise ConnectionError(f"Unexpected Live setup response: {setup}")
+            session = AsyncSession(api_client=sdk_api_client(), websocket=websocket)
+            self._stack.push_async_exit(stack.pop_all())
+        return session
+
+    async def open_until(self, done, retry_delay):
+        """Keep trying to connect until it succeeds or the ``done`` event is set.
+
+        Used for speculative connects: attempts are retried with exponential
+        backoff only while ``done`` (the interview preparation) is still pending.
+        Returns True once connected.
+        """
+        delay = retry_delay
+        attempt = 1
+        while True:
+            try:
+                await self.open()
+                return True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.LIVE_CONNECT_FAILURES.inc()
+                logger.warning("Speculative Live connect attempt %d failed: %s", attempt, e)
+            if done.is_set():
+                return False
+            try:
+                await asyncio.wait_for(done.wait(), delay)
+                return False  # preparation finished; the handler connects the ordinary way
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, 8.0)
+            attempt += 1
+
+    def is_open(self):
+        """Whether the underlying websocket is still open (keepalive pings close dead ones)"""
+        if self.session is None:
+            return False
+        websocket = getattr(self.session, "_ws", None)
+        return websocket is None or getattr(websocket, "close_code", None) is None
+
+    def age(self):
+        return time.monotonic() - self.opened_at if self.opened_at is not None else 0.0
+
+    async def close(self):
+        self.session = None
+        try:
+            await self._stack.aclose()
+        except Exception as e:
+            logger.warning("Error closing Live session: %s", e)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from collections import deque
+
+from services import metrics
+from services.live_connection import LiveConnection
+from config.config import CONFIG, MODEL, LIVE_POOL_SIZE, LIVE_POOL_MAX_IDLE_SECONDS, LIVE_POOL_CHECK_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def pool_key(model, config):
+    """Sessions are interchangeable only when opened with the same model and config"""
+    return model, config.model_dump_json(exclude_none=True)
+
+
+class LiveSessionPool:
+    """Keeps ``size`` idle, already connected Live sessions per (model, config).
+
+    ``acquire`` hands out the freshest healthy session without waiting and
+    starts a replacement in the background. A maintenance task closes
+    sessions that have been idle longer than ``max_idle`` or whose websocket
+    has closed, and tops every pool back up. With ``size`` 0 the pool is off
+    and ``acquire`` always misses.
+    """
+
+    def __init__(self, size, max_idle, check_interval):
+        self.size = size
+        self.max_idle = max_idle
+        self.check_interval = check_interval
+        self._idle = {}
+        self._configs = {}
+        self._connecting = {}
+        self._tasks = set()
+        self._maintenance = None
+        self.hits = 0
+        self.misses = 0
+        self.discarded = {"expired": 0, "unhealthy": 0}
+        self.connect_failures = 0
+
+    async def start(self, model=MODEL, config=CONFIG):
+        """Begin filling the pool for (model, config); call from the running event loop"""
+        if not self.size:
+            return
+        self._register(model, config)
+        if self._maintenance is None:
+            self._maintenance = asyncio.create_task(self._maintain())
+        logger.info("Live session pool started with %d sessions per config", self.size)
+
+    def _register(self, model, config):
+        key = pool_key(model, config)
+        if key not in self._configs:
+            self._configs[key] = (model, config)
+            self._idle[key] = deque()
+            self._connecting[key] = 0
+        return key
+
+    def acquire(self, model=MODEL, config=CONFIG):
+        """Return an open LiveConnection from the pool, or None if none is ready"""
+        if not self.size:
+            return None
+        key = self._register(model, config)
+        idle = self._idle[key]
+        connection = None
+        while idle:
+            candidate = idle.pop()  # most recently opened first
+            if self._usable(candidate):
+                connection = candidate
+                break
+        self._refill(key)
+        if connection is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return connection
+
+    def _usable(self, connection):
+        """Health check; closes and counts the connection if it is not usable"""
+        if not connection.is_open():
+            reason = "unhealthy"
+        elif connection.age() > self.max_idle:
+            reason = "expired"
+        else:
+            return True
+        self.discarded[reason] += 1
+        self._spawn(connection.close())
+        return False
+
+    def _refill(self, key):
+        missing = self.size - len(self._idle[key]) - self._connecting[key]
+        for _ in range(missing):
+            self._connecting[key] += 1
+            self._spawn(self._connect(key))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _connect(self, key):
+        model, config = self._configs[key]
+        connection = LiveConnection(model, config)
+        try:
+            await connection.open()
+        except Exception as e:
+            # The next maintenance pass retries, which paces reconnects during an outage
+            self.connect_failures += 1
+            metrics.LIVE_CONNECT_FAILURES.inc()
+            logger.warning("Live session pool connect failed: %s", e)
+            return
+        finally:
+            self._connecting[key] -= 1
+        self._idle[key].append(connection)
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for key, idle in self._idle.items():
+                # Oldest sessions sit at the left; keep the healthy ones in order
+                self._idle[key] = deque(connection for connection in idle if self._usable(connection))
+                self._refill(key)
+
+    async def close(self):
+        """Stop maintenance and close every idle session"""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for idle in self._idle.values():
+            while idle:
+                await idle.pop().close()
+
+    def idle_count(self):
+        return sum(len(idle) for idle in self._idle.values())
+
+    def connecting_count(self):
+        return sum(self._connecting.values())
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "idle": self.idle_count(),
+            "connecting": self.connecting_count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": dict(self.discarded),
+            "connect_failures": self.connect_failures,
+        }
+
+
+live_session_pool = LiveSessionPool(LIVE_POOL_SIZE, LIVE_POOL_MAX_IDLE_SECONDS, LIVE_POOL_CHECK_SECONDS)
+
+metrics.LIVE_POOL_IDLE_SESSIONS.set_function(live_session_pool.idle_count)
+metrics.LIVE_POOL_CONNECTING.set_function(live_session_pool.connecting_count)
+metrics.LIVE_POOL_ACQUIRES.set_function(
+    lambda: {("hit",): live_session_pool.hits, ("miss",): live_session_pool.misses})
+metrics.LIVE_POOL_DISCARDED.set_function(
+    lambda: {(reason,): count for reason, count in live_session_pool.discarded.items()})
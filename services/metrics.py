@@ -0,0 +1,240 @@
+import math
+import os
+import resource
+import time
+from bisect import bisect_left
+
+# Process-wide metrics rendered in the Prometheus text exposition format.
+#
+# Updates are plain attribute arithmetic with no locks: every update happens
+# on the event loop thread, where it cannot interleave with another update.
+# Values that already live elsewhere (queue depths, cache counters) are
+# exposed through callbacks evaluated only when /metrics is scraped.
+
+_registry = []
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._function = None
+        if not self.labelnames:
+            self.labels()  # unlabelled metrics are exported from the start
+        _registry.append(self)
+
+    def labels(self, **labels):
+        """Return the child for these label values; bind it once on hot paths"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        return self.labels() if not self.labelnames else None
+
+    def set_function(self, function):
+        """Take the value from function() at scrape time; it may return a number
+        or, for labelled metrics, a dict of label-value tuples to numbers"""
+        self._function = function
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        if self._function is not None:
+            value = self._function()
+            items = value.items() if isinstance(value, dict) else [((), value)]
+            for key, sample in items:
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(sample)}")
+        else:
+            for key, child in self._children.items():
+                lines.extend(child.render(self.name, self.labelnames, key))
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+    def render(self, name, labelnames, key):
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+    def dec(self, amount=1):
+        self._default().dec(amount)
+
+    def set(self, value):
+        self._default().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * len(upper_bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labelnames, key):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds, self.counts):
+            cumulative += count
+            labels = _format_labels(labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, key)
+        lines.append(f"{name}_sum{labels} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{labels} {self.count}")
+        return lines
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.upper_bounds = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+
+def render_metrics():
+    """Render every registered metric in the Prometheus text format"""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+PREPARE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+CHUNK_BYTES_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+LIVE_CONNECT_SECONDS = Histogram(
+    "interview_live_connect_seconds", "Time to establish the Gemini Live session", LATENCY_BUCKETS
+)
+FIRST_AUDIO_SECONDS = Histogram(
+    "interview_first_audio_seconds", "Time from sending initial_prompt to the first audio byte sent to the client",
+    LATENCY_BUCKETS,
+)
+TURN_LATENCY_SECONDS = Histogram(
+    "interview_turn_latency_seconds",
+    "Time from the candidate's end of speech to the first Gemini audio byte sent to the client",
+    LATENCY_BUCKETS,
+)
+AUDIO_CHUNK_BYTES = Histogram(
+    "interview_audio_chunk_bytes", "Size of audio chunks sent to Gemini (upstream) and to the client (downstream)",
+    CHUNK_BYTES_BUCKETS, labelnames=("direction",),
+)
+PREPARE_STAGE_SECONDS = Histogram(
+    "interview_prepare_stage_seconds", "Duration of each prepare_interview stage", PREPARE_BUCKETS,
+    labelnames=("stage",),
+)
+GREETING_SECONDS = Histogram(
+    "interview_greeting_seconds",
+    "Time from the client connecting to the first Gemini audio byte sent to it, preparation included",
+    PREPARE_BUCKETS,
+)
+LIVE_CONNECT_FAILURES = Counter("interview_live_connect_failures_total", "Failed Gemini Live connect attempts")
+ACTIVE_SESSIONS = Gauge("interview_active_sessions", "Interview websocket sessions currently running")
+
+# Callback-backed metrics; their functions are installed by the modules owning the state
+AUDIO_QUEUE_DEPTH_BYTES = Gauge("interview_audio_queue_depth_bytes", "PCM bytes queued for Gemini across sessions")
+AUDIO_QUEUE_DEPTH_FRAMES = Gauge("interview_audio_queue_depth_frames", "Audio chunks queued for Gemini across sessions")
+AUDIO_DROPPED_BYTES = Counter(
+    "interview_audio_dropped_bytes_total", "PCM bytes shed by upstream audio queue backpressure"
+)
+VAD_INPUT_BYTES = Counter("interview_vad_input_bytes_total", "Client PCM bytes seen by voice activity detection")
+VAD_SUPPRESSED_BYTES = Counter(
+    "interview_vad_suppressed_bytes_total", "Client PCM bytes dropped as silence before going upstream"
+)
+UPSTREAM_FRAMES = Counter("interview_upstream_frames_total", "Client audio chunks coalesced into upstream packets")
+UPSTREAM_SENDS = Counter("interview_upstream_sends_total", "send_realtime_input calls carrying audio")
+CACHE_LOOKUPS = Counter(
+    "interview_cache_lookups_total", "Analysis and question cache lookups by result",
+    labelnames=("cache", "result"),
+)
+LIVE_POOL_IDLE_SESSIONS = Gauge("interview_live_pool_idle_sessions", "Pre-connected Live sessions waiting in the pool")
+LIVE_POOL_CONNECTING = Gauge("interview_live_pool_connecting", "Live sessions the pool is currently opening")
+LIVE_POOL_ACQUIRES = Counter(
+    "interview_live_pool_acquires_total", "Live session requests served from the pool (hit) or not (miss)",
+    labelnames=("result",),
+)
+LIVE_POOL_DISCARDED = Counter(
+    "interview_live_pool_discarded_total", "Idle pooled Live sessions closed before use, by reason",
+    labelnames=("reason",),
+)
+
+
+def _resident_memory_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs (macOS): fall back to the peak, which ru_maxrss reports in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# Process totals, so load tests can derive CPU and memory per interview session
+PROCESS_CPU_SECONDS = Counter("process_cpu_seconds_total", "User and system CPU time spent by this process")
+PROCESS_CPU_SECONDS.set_function(time.process_time)
+PROCESS_RESIDENT_MEMORY = Gauge("process_resident_memory_bytes", "Resident memory of this process")
+PROCESS_RESIDENT_MEMORY.set_function(_resident_memory_bytes)
+# Every metric here is this worker's alone; scrapers use this to tell whether that is the whole server
+WEB_WORKERS = Gauge("interview_web_workers", "uvicorn worker processes serving the app, each with its own metrics")
+WEB_WORKERS.set_function(lambda: int(os.environ.get("WEB_CONCURRENCY", 1)))
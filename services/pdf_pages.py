@@ -0,0 +1,8 @@
+from pdfminer.pdfpage import PDFPage
+
+
+# Runs in the PDF process pool, so this module only imports pdfminer
+def count_pdf_pages(path, limit):
+    """Number of pages, counting no further than limit"""
+    with open(path, "rb") as handle:
+        return sum(1 for _ in PDFPage.get_pages(handle, maxpages=limit))
@@ -0,0 +1,80 @@
+import threading
+
+from services.cache import content_key
+
+
+class QuestionStore:
+    """Generated question sets, kept in the shared session store.
+
+    A question set is keyed by resume hash, JD hash, interviewer role,
+    difficulty and question prompt version, and expires ``ttl`` seconds after
+    it was generated; reading it does not extend that. Since the sets live in
+    the session store, one generated or invalidated by any worker is seen by
+    every worker.
+    """
+
+    PREFIX = "questions:"
+
+    def __init__(self, store, ttl):
+        self.store = store
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, resume_hash, jd_hash, role, difficulty, prompt_version):
+        return cls.PREFIX + content_key(resume_hash, jd_hash, role, difficulty, prompt_version)
+
+    async def get(self, resume_hash, jd_hash, role, difficulty, prompt_version):
+        """Return the stored question set, or None if absent or expired"""
+        entry = await self.store.aget(self.key(resume_hash, jd_hash, role, difficulty, prompt_version))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry["questions"]
+
+    async def put(self, questions, resume_hash, jd_hash, role, difficulty, prompt_version):
+        meta = {
+            "resume_hash": resume_hash,
+            "jd_hash": jd_hash,
+            "role": role,
+            "difficulty": difficulty,
+            "prompt_version": prompt_version,
+        }
+        await self.store.aset(
+            self.key(resume_hash, jd_hash, role, difficulty, prompt_version),
+            {"meta": meta, "questions": questions},
+            self.ttl,
+        )
+
+    def invalidate(self, resume_hash=None, jd_hash=None, role=None, difficulty=None):
+        """Drop every question set matching all given fields; returns the count removed.
+
+        Called with no arguments it clears the whole store. Prompts rendered
+        from a dropped set are not reused either (see InterviewState.prepare).
+        """
+        wanted = {field: value for field, value in (
+            ("resume_hash", resume_hash), ("jd_hash", jd_hash), ("role", role), ("difficulty", difficulty),
+        ) if value is not None}
+        matching = []
+        for key in self.store.keys(self.PREFIX):
+            entry = self.store.get(key)
+            if entry is not None and all(entry["meta"].get(field) == value for field, value in wanted.items()):
+                matching.append(key)
+        self.store.delete(*matching)
+        return len(matching)
+
+    def stats(self):
+        """Hit/miss counters of this process and the number of stored sets; blocks on the store"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+        stats["entries"] = len(self.store.keys(self.PREFIX))
+        return stats
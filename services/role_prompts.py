@@ -0,0 +1,98 @@
+import asyncio
+import importlib
+import inspect
+import logging
+import uuid
+from types import MappingProxyType
+
+from services import final_prompt, prompts
+from services.cache import content_key
+
+logger = logging.getLogger(__name__)
+
+# Store key naming the latest reload, so every worker can tell it missed one
+GENERATION_KEY = "prompts:generation"
+
+
+class RolePromptCache:
+    """Agent prompt templates with each role's static material already rendered.
+
+    For every role known to the question generator, the role-only
+    placeholders (interviewer persona, focus areas, evaluation criteria, ...)
+    are substituted once, leaving a frozen template whose only open slots are
+    the per-candidate fields. ``reload`` re-imports ``services.prompts``
+    (the agent prompt) and ``services.final_prompt`` (context, follow-ups and
+    evaluation criteria) and rebuilds every template, then swaps them in
+    atomically, so edits to those take effect without a restart. The role
+    tables (personas, focus areas, interviewer details) belong to the
+    question generator and still need a restart.
+
+    With a shared ``store``, ``publish_reload`` also records a new generation
+    there, and ``sync`` reloads any worker that has not seen it yet.
+    """
+
+    def __init__(self, qa_generator, store=None):
+        self.qa_generator = qa_generator
+        self.store = store
+        self._templates = MappingProxyType({})
+        self._sync_lock = asyncio.Lock()
+        self.load()
+        # Freshly imported prompts already include every earlier reload
+        self.generation = store.get(GENERATION_KEY) if store is not None else None
+
+    def load(self):
+        templates = {}
+        base = final_prompt.compile_prompt(prompts.agent_prompt)
+        for role in self.qa_generator.role_specific_guidelines:
+            templates[role] = base.partial(final_prompt.role_prompt_values(
+                role,
+                self.qa_generator.role_personalities[role],
+                self.qa_generator.question_focus[role],
+                self.qa_generator.interviewer_details[role],
+            ))
+        self._templates = MappingProxyType(templates)
+        # Identifies the reloadable prompt material, so prompts rendered before a reload can be told apart
+        self.version = content_key(prompts.agent_prompt, inspect.getsource(final_prompt))[:16]
+        logger.info("Pre-rendered prompts for roles: %s", ", ".join(templates))
+
+    def reload(self):
+        """Pick up edits to services/prompts.py and services/final_prompt.py and rebuild every role's template"""
+        importlib.reload(prompts)
+        # final_prompt compiles the default agent prompt on import, so it goes second
+        importlib.reload(final_prompt)
+        self.load()
+        return list(self._templates)
+
+    async def publish_reload(self):
+        """Reload here, then tell the other workers through the store"""
+        roles = await asyncio.to_thread(self.reload)
+        if self.store is not None:
+            generation = uuid.uuid4().hex
+            await self.store.aset(GENERATION_KEY, generation)
+            self.generation = generation
+        return roles
+
+    async def sync(self):
+        """Reload if another worker published a reload this one has not applied"""
+        if self.store is None:
+            return
+        generation = await self.store.aget(GENERATION_KEY)
+        if generation is None or generation == self.generation:
+            return
+        async with self._sync_lock:
+            if generation == self.generation:
+                return
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as e:
+                # The publishing worker validated these prompts; keep serving the old ones
+                logger.exception("Error applying prompt reload %s: %s", generation, e)
+            self.generation = generation
+
+    @property
+    def roles(self):
+        return list(self._templates)
+
+    def render(self, role, mins, candidate_name, objective, questions):
+        """Render the final prompt for one candidate; raises KeyError for an unknown role"""
+        return self._templates[role].render(final_prompt.candidate_prompt_values(mins, candidate_name, objective, questions))
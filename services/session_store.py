@@ -0,0 +1,206 @@
+import abc
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from config.config import SESSION_STORE_URL
+
+try:
+    import redis
+except ImportError:  # optional; only needed for redis:// stores
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(abc.ABC):
+    """Key/value store for interview sessions and their artifacts, shared by workers.
+
+    Values are JSON-serialisable and expire ``ttl`` seconds after they were
+    last written or read with a ``ttl``. The methods block; async code uses
+    the ``a``-prefixed wrappers, which run them in a thread.
+    """
+
+    @abc.abstractmethod
+    def get(self, key, ttl=None):
+        """Return the value for key, or None; with ttl, also restart its expiry clock"""
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        """Store value under key, expiring ttl seconds from now if given"""
+
+    @abc.abstractmethod
+    def delete(self, *keys):
+        """Remove keys; missing ones are ignored"""
+
+    @abc.abstractmethod
+    def keys(self, prefix):
+        """Live keys starting with prefix"""
+
+    def purge_expired(self):
+        """Drop expired entries; backends that expire keys themselves do nothing"""
+
+    def close(self):
+        pass
+
+    async def aget(self, key, ttl=None):
+        return await asyncio.to_thread(self.get, key, ttl)
+
+    async def aset(self, key, value, ttl=None):
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def adelete(self, *keys):
+        await asyncio.to_thread(self.delete, *keys)
+
+
+class MemorySessionStore(SessionStore):
+    """Store private to this process; only correct with a single worker"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            if ttl is not None:
+                self._entries[key] = (time.time() + ttl, value)
+            return value
+
+    def set(self, key, value, ttl=None):
+        # Round-trip through JSON so callers never share mutable state with the store
+        value = json.loads(json.dumps(value))
+        with self._lock:
+            self._entries[key] = (time.time() + ttl if ttl is not None else None, value)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def keys(self, prefix):
+        now = time.time()
+        with self._lock:
+            return [key for key, (expires_at, _) in self._entries.items()
+                    if key.startswith(prefix) and (expires_at is None or expires_at > now)]
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            for key in [key for key, (expires_at, _) in self._entries.items()
+                        if expires_at is not None and expires_at <= now]:
+                del self._entries[key]
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store in one SQLite database file, shared by every worker that can open it.
+
+    WAL mode lets readers proceed while another process writes, so this suits
+    several workers on one host (or one shared volume); nodes without a common
+    filesystem need the Redis backend.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key, ttl=None):
+        now = time.time()
+        with self._lock:
+            if ttl is not None:
+                self._db.execute("UPDATE entries SET expires_at = ? WHERE key = ? AND expires_at > ?",
+                                 (now + ttl, key, now))
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, now)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                             (key, json.dumps(value), expires_at))
+
+    def delete(self, *keys):
+        with self._lock:
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+
+    def keys(self, prefix):
+        # Keys are built from hex digests and fixed prefixes, so LIKE needs no escaping
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM entries WHERE key LIKE ? AND (expires_at IS NULL OR expires_at > ?)",
+                (prefix + "%", time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge_expired(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RedisSessionStore(SessionStore):
+    """Store in Redis (or anything speaking its protocol), for workers on several nodes"""
+
+    def __init__(self, url, namespace="interviewer:"):
+        if redis is None:
+            raise RuntimeError("The redis package is required for redis:// session stores")
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+
+    def get(self, key, ttl=None):
+        name = self.namespace + key
+        raw = self.client.getex(name, ex=int(ttl)) if ttl is not None else self.client.get(name)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.namespace + key, json.dumps(value), ex=int(ttl) if ttl is not None else None)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.namespace + key for key in keys))
+
+    def keys(self, prefix):
+        start = len(self.namespace)
+        return [name.decode()[start:] for name in self.client.scan_iter(match=f"{self.namespace}{prefix}*")]
+
+    def close(self):
+        self.client.close()
+
+
+def open_session_store(url):
+    """Open the store named by url: memory://, sqlite:///path/to/file.db or redis://host:port/db"""
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return MemorySessionStore()
+    if scheme == "sqlite":
+        return SQLiteSessionStore(url[len("sqlite:///"):])
+    if scheme in ("redis", "rediss"):
+        return RedisSessionStore(url)
+    raise ValueError(f"Unsupported session store URL {url!r}")
+
+
+# Sessions and their artifacts, visible to every worker
+session_store = open_session_store(SESSION_STORE_URL)
@@ -0,0 +1,90 @@
+import asyncio
+import contextvars
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineTimerWheel:
+    """Hashed timer wheel serving re-armable deadlines for every session in the process.
+
+    ``arm`` is O(1) and meant to be called on every audio frame: it only
+    records the new deadline, and a key already in the wheel is not moved
+    until its slot comes round. A single task ticks every ``tick`` seconds
+    while any deadline is armed, so idle sessions cost no wakeups at all.
+    Expired callbacks (coroutine functions) are started as tasks on the loop,
+    in the context ``arm`` was last called from, so they log with the arming
+    session's ID.
+    """
+
+    def __init__(self, tick=0.1, slots=256):
+        self.tick = tick
+        self.slots = [set() for _ in range(slots)]
+        self._deadlines = {}
+        self._task = None
+        self._next_tick = None
+        self._callbacks = set()
+
+    def _tick_of(self, deadline):
+        return int(deadline / self.tick)
+
+    def arm(self, key, timeout, callback):
+        """(Re)arm key to call callback() once timeout seconds from now"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        scheduled = key in self._deadlines
+        self._deadlines[key] = (deadline, callback, contextvars.copy_context())
+        if not scheduled:
+            self.slots[self._tick_of(deadline) % len(self.slots)].add(key)
+        if self._task is None or self._task.done():
+            self._next_tick = self._tick_of(loop.time())
+            # The wheel serves every session, so it must not inherit this one's context
+            self._task = loop.create_task(self._run(), context=contextvars.Context())
+
+    def cancel(self, key):
+        """Disarm key; its stale slot entry is discarded lazily"""
+        self._deadlines.pop(key, None)
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._deadlines:
+            await asyncio.sleep(self.tick)
+            now = loop.time()
+            # Only expire ticks that have fully elapsed, so every deadline in the slot is due
+            current = self._tick_of(now)
+            while self._next_tick < current:
+                self._expire(self._next_tick, now)
+                self._next_tick += 1
+
+    def _expire(self, tick, now):
+        slot = self.slots[tick % len(self.slots)]
+        for key in list(slot):
+            entry = self._deadlines.get(key)
+            if entry is None:
+                slot.discard(key)
+                continue
+            deadline, callback, context = entry
+            if deadline <= now:
+                slot.discard(key)
+                del self._deadlines[key]
+                task = asyncio.get_running_loop().create_task(self._fire(callback), context=context)
+                self._callbacks.add(task)
+                task.add_done_callback(self._callbacks.discard)
+                continue
+            target = self._tick_of(deadline) % len(self.slots)
+            if target != tick % len(self.slots):
+                slot.discard(key)
+                self.slots[target].add(key)
+
+    async def _fire(self, callback):
+        try:
+            await callback()
+        except Exception as e:
+            logger.exception("Error in silence timer callback: %s", e)
+
+
+# Shared by every GeminiAudioWebSocketHandler in the process
+silence_timers = DeadlineTimerWheel()
@@ -0,0 +1,45 @@
+from functools import lru_cache
+
+
+class SkillIndex:
+    """Answers "does any indexed phrase occur in this text, or this text in a phrase?".
+
+    This is the two-way case-insensitive substring test used to match resume
+    skills against job description phrases, without comparing every pair.
+    Phrases are lower-cased once and kept in a set, so finding a phrase inside
+    a short query only needs set lookups of the query's substrings at the
+    lengths some phrase actually has. The reverse direction is a single
+    substring search of all phrases joined by newlines, which runs in C.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = frozenset(phrase.lower() for phrase in phrases)
+        self._lengths = sorted({len(phrase) for phrase in self.phrases})
+        self._joined = "\n".join(self.phrases)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def overlaps(self, text):
+        """True if some phrase contains text or is contained in it, ignoring case"""
+        if not self.phrases:
+            return False
+        text = text.lower()
+
+        for length in self._lengths:
+            if length > len(text):
+                break
+            for start in range(len(text) - length + 1):
+                if text[start:start + length] in self.phrases:
+                    return True
+
+        # A text without newlines cannot match across the joins
+        if "\n" in text:
+            return any(text in phrase for phrase in self.phrases)
+        return text in self._joined
+
+
+@lru_cache(maxsize=256)
+def skill_index(phrases):
+    """Shared index for a tuple of phrases, e.g. one resume's skills"""
+    return SkillIndex(phrases)
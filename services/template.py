@@ -0,0 +1,77 @@
+import re
+
+PLACEHOLDER = re.compile(r"\{\{([A-Za-z_][\w.]*)\}\}")
+
+
+class CompiledTemplate:
+    """A ``{{name}}`` template split once into literal and placeholder segments.
+
+    ``fields`` declares the placeholder names the caller will supply. Compiling
+    fails if the template uses a name that is not declared or a declared name
+    never appears, so typos surface at import rather than as raw ``{{...}}``
+    text in a prompt. ``render`` fills every slot in one join; substituted
+    values are never scanned again, so ``{{...}}`` inside candidate-supplied
+    text stays literal.
+    """
+
+    def __init__(self, source, fields):
+        self.source = source
+        self.fields = frozenset(fields)
+
+        self._parts = []
+        self._slots = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            self._parts.append(source[position:match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            self._parts.append(None)
+            position = match.end()
+        self._parts.append(source[position:])
+
+        used = {name for _, name in self._slots}
+        unknown = used - self.fields
+        if unknown:
+            raise ValueError(f"Template uses undeclared placeholders: {', '.join(sorted(unknown))}")
+        missing = self.fields - used
+        if missing:
+            raise ValueError(f"Declared placeholders missing from template: {', '.join(sorted(missing))}")
+
+    def partial(self, values):
+        """Return a template with the given placeholders filled in and the rest left open.
+
+        Adjacent literals are merged, so rendering the result costs one slot per
+        remaining placeholder. Like ``render``, the filled values are not rescanned.
+        """
+        unknown = values.keys() - self.fields
+        if unknown:
+            raise KeyError(f"Unknown placeholders: {', '.join(sorted(unknown))}")
+        template = object.__new__(CompiledTemplate)
+        template.source = self.source
+        template.fields = self.fields - values.keys()
+        template._parts = []
+        template._slots = []
+        slot_names = dict(self._slots)
+        literal = []
+        for index, part in enumerate(self._parts):
+            name = slot_names.get(index)
+            if name is None:
+                literal.append(part)
+            elif name in values:
+                literal.append(values[name])
+            else:
+                template._parts.append("".join(literal))
+                template._slots.append((len(template._parts), name))
+                template._parts.append(None)
+                literal = []
+        template._parts.append("".join(literal))
+        return template
+
+    def render(self, values):
+        """Substitute every placeholder from values (a mapping of name to str)"""
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Missing values for placeholders: {', '.join(sorted(missing))}")
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            parts[index] = values[name]
+        return "".join(parts)
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+
+from config.config import UPLOAD_MAX_BYTES, UPLOAD_MAX_PAGES, UPLOAD_CHUNK_BYTES
+from services.gemini_script import get_pdf_pool
+from services.pdf_pages import count_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+
+class UploadRejected(Exception):
+    """An upload that failed validation; status_code is the HTTP status to answer with"""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StoredUpload:
+    def __init__(self, path, sha256, size, deduplicated):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.deduplicated = deduplicated
+
+
+class MultipartUpload:
+    """One file field of a multipart/form-data request, parsed as the body arrives.
+
+    It has the async read() of an UploadFile, so save_upload can hash, check
+    and write the file chunk by chunk. Unlike an UploadFile, nothing is
+    received before the handler runs: an upload that breaks a limit stops
+    being read at that point. Other fields are skipped.
+    """
+
+    def __init__(self, request, field="file"):
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise UploadRejected(400, "Expected a multipart/form-data upload")
+        self.field = field.encode()
+        self._body = request.stream().__aiter__()
+        self._pending = bytearray()  # parsed bytes of the field not read yet
+        self._found = False
+        self._done = False
+        self._in_field = False
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self):
+        self._disposition = b""
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, params = parse_options_header(self._disposition)
+        self._in_field = not self._found and params.get(b"name") == self.field
+        self._found = self._found or self._in_field
+
+    def _on_part_data(self, data, start, end):
+        if self._in_field:
+            self._pending += data[start:end]
+
+    def _on_part_end(self):
+        if self._in_field:
+            self._in_field = False
+            self._done = True  # the rest of the body is not needed
+
+    async def read(self, size):
+        while len(self._pending) < size and not self._done:
+            try:
+                chunk = await self._body.__anext__()
+            except StopAsyncIteration:
+                self._parser.finalize()
+                self._done = True
+                break
+            self._parser.write(chunk)
+        if self._done and not self._found:
+            raise UploadRejected(400, f"No {self.field.decode()!r} field in the upload")
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+
+def _write_chunk(handle, hasher, chunk):
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+async def save_upload(file, directory, max_bytes=UPLOAD_MAX_BYTES, max_pages=UPLOAD_MAX_PAGES,
+                      chunk_bytes=UPLOAD_CHUNK_BYTES):
+    """Stream a PDF upload to ``directory/<sha256>.pdf``.
+
+    Chunks are hashed and written in a worker thread, so the event loop never
+    blocks on disk and the file is never held in memory whole. Uploads whose
+    content is already stored are dropped in favour of the existing file.
+    Raises UploadRejected for empty, non-PDF, oversized or too-long documents.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    partial = directory / f"{secrets.token_hex(8)}.part"
+    # Created like any other file (0666 less the umask), so other users of a shared
+    # volume can read the stored PDF
+    fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while chunk := await file.read(chunk_bytes):
+                if size == 0 and not chunk.startswith(b"%PDF-"):
+                    raise UploadRejected(415, "Only PDF files are accepted")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(413, f"File exceeds the {max_bytes} byte upload limit")
+                await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+        if size == 0:
+            raise UploadRejected(400, "Empty upload")
+
+        digest = hasher.hexdigest()
+        path = directory / f"{digest}.pdf"
+        if path.exists():
+            os.unlink(partial)
+            return StoredUpload(path, digest, size, deduplicated=True)
+
+        try:
+            # pdfminer is pure Python; like parsing, it runs in the PDF pool to keep off this GIL
+            pages = await asyncio.get_running_loop().run_in_executor(
+                get_pdf_pool(), count_pdf_pages, partial, max_pages + 1
+            )
+        except Exception as e:
+            raise UploadRejected(422, f"Unreadable PDF: {e}")
+        if pages > max_pages:
+            raise UploadRejected(413, f"PDF exceeds the {max_pages} page limit")
+        os.replace(partial, path)
+        return StoredUpload(path, digest, size, deduplicated=False)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
@@ -0,0 +1,87 @@
+from collections import deque
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """Energy / zero-crossing voice activity detector for 16-bit mono PCM.
+
+    A chunk counts as speech when its RMS level is above
+    ``energy_threshold_db`` (dBFS) and its zero-crossing rate is at most
+    ``max_zero_crossing_rate``; loud broadband hiss crosses zero far more
+    often than voiced speech. After speech, chunks keep being forwarded for
+    ``hangover_ms`` so trailing syllables and the pause Gemini's own activity
+    detection listens for still go upstream. While silent, the last
+    ``preroll_ms`` of audio is held back and released ahead of the first
+    speech chunk so word onsets are not clipped. Everything else is dropped.
+    """
+
+    def __init__(self, sample_rate, energy_threshold_db=-50.0, max_zero_crossing_rate=0.35,
+                 hangover_ms=1200, preroll_ms=200, sample_width=2):
+        bytes_per_ms = sample_rate * sample_width / 1000
+        # Compare mean-square power against the threshold to avoid a sqrt/log per chunk
+        self.power_threshold = (32768.0 * 10 ** (energy_threshold_db / 20)) ** 2
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.hangover_bytes = int(hangover_ms * bytes_per_ms)
+        self.preroll_bytes = int(preroll_ms * bytes_per_ms)
+
+        self._preroll = deque()
+        self._preroll_size = 0
+        self._hangover_left = 0
+        self.in_speech = False
+        # Whether the most recent input chunk was itself classified as speech
+        self.last_is_speech = False
+
+        self.bytes_in = 0
+        self.bytes_suppressed = 0
+
+    def is_speech(self, pcm):
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if len(samples) == 0:
+            return False
+        floats = samples.astype(np.float32)
+        power = float(np.dot(floats, floats)) / len(samples)
+        if power < self.power_threshold:
+            return False
+        crossings = np.count_nonzero(np.diff(np.signbit(samples)))
+        return crossings / len(samples) <= self.max_zero_crossing_rate
+
+    def process(self, pcm):
+        """Return the list of chunks to forward upstream for this input chunk"""
+        size = len(pcm)
+        self.bytes_in += size
+
+        self.last_is_speech = self.is_speech(pcm)
+        if self.last_is_speech:
+            self.in_speech = True
+            self._hangover_left = self.hangover_bytes
+            forward = list(self._preroll)
+            forward.append(pcm)
+            self._preroll.clear()
+            self._preroll_size = 0
+            return forward
+
+        if self._hangover_left > 0:
+            self._hangover_left -= size
+            return [pcm]
+
+        # Silence: keep a short pre-roll and drop whatever falls out of it
+        self.in_speech = False
+        self._preroll.append(pcm)
+        self._preroll_size += size
+        while self._preroll and self._preroll_size - len(self._preroll[0]) >= self.preroll_bytes:
+            dropped = self._preroll.popleft()
+            self._preroll_size -= len(dropped)
+            self.bytes_suppressed += len(dropped)
+        return []
+
+    @property
+    def suppressed_ratio(self):
+        return self.bytes_suppressed / self.bytes_in if self.bytes_in else 0.0
+
+    def stats(self):
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_suppressed": self.bytes_suppressed,
+            "suppressed_ratio": self.suppressed_ratio,
+        }
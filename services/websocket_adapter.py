@@ -0,0 +1,54 @@
+import logging
+
+from starlette.websockets import WebSocketDisconnect
+from websockets.exceptions import ConnectionClosedOK
+
+logger = logging.getLogger(__name__)
+
+
+class StarletteWebSocketAdapter:
+    """Gives a Starlette WebSocket the part of the ``websockets`` connection API the
+    interview handler uses: ``remote_address``, ``send`` and async iteration.
+
+    Sending on a closed socket raises ``ConnectionClosedOK`` just as the standalone
+    server would, so the handler treats both transports the same way.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+
+    @property
+    def remote_address(self):
+        client = self.websocket.client
+        return (client.host, client.port) if client else None
+
+    async def send(self, message):
+        try:
+            if isinstance(message, (bytes, bytearray, memoryview)):
+                await self.websocket.send_bytes(bytes(message))
+            else:
+                await self.websocket.send_text(message)
+        except (WebSocketDisconnect, RuntimeError, OSError) as e:
+            raise ConnectionClosedOK(None, None) from e
+
+    async def close(self, code=1000, reason=""):
+        try:
+            await self.websocket.close(code, reason)
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            pass  # already closed
+
+    def __aiter__(self):
+        return self._messages()
+
+    async def _messages(self):
+        while True:
+            try:
+                message = await self.websocket.receive()
+            except (WebSocketDisconnect, RuntimeError):
+                return
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                yield message["bytes"]
+            elif message.get("text") is not None:
+                yield message["text"]